@@ -2,17 +2,20 @@
 
 from __future__ import annotations
 
+import asyncio
 import os
 from dataclasses import dataclass
 from typing import Any
 from urllib.parse import quote
 
 import httpx
+import orjson
+from pydantic import BaseModel
 
 from integrations.mcp_server.tool_registry import ToolSpec
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class ToolClassConfig:
     """Timeout/retry behavior by tool class."""
 
@@ -27,6 +30,9 @@ DEFAULT_CLASS_CONFIG: dict[str, ToolClassConfig] = {
 }
 
 
+_JSON_HEADERS = {"content-type": "application/json"}
+
+
 class HttpToolError(RuntimeError):
     """Structured HTTP/transport failure for tool calls."""
 
@@ -36,15 +42,48 @@ class HttpToolError(RuntimeError):
 
 
 class CxxtractHttpClient:
-    """Thin HTTP client for tool dispatch."""
+    """Thin HTTP client for tool dispatch.
+
+    One pooled ``httpx.AsyncClient`` is shared by all tool calls so keep-alive
+    connections are reused and concurrent calls overlap on the event loop.
+    At most ``CXXTRACT_MCP_WORKERS`` requests are in flight at once.
+    ``CXXTRACT_MCP_HTTP2=true`` multiplexes them over one HTTP/2 connection
+    when the service sits behind a TLS proxy that negotiates h2 (needs the
+    ``http2`` extra); otherwise httpx stays on HTTP/1.1 keep-alive.
+    """
 
     def __init__(self, base_url: str | None = None) -> None:
         self.base_url = (base_url or os.getenv("CXXTRACT_BASE_URL") or "http://127.0.0.1:8000").rstrip("/")
         self._allow_side_effect_retry = (
             os.getenv("CXXTRACT_MCP_RETRY_SIDE_EFFECTFUL", "false").strip().lower() == "true"
         )
+        max_in_flight = max(1, int(os.getenv("CXXTRACT_MCP_WORKERS", "16")))
+        self._slots = asyncio.Semaphore(max_in_flight)
+        self._config_cache: dict[str, ToolClassConfig] = {}
+        self._url_cache: dict[str, str] = {}
+        use_http2 = os.getenv("CXXTRACT_MCP_HTTP2", "false").strip().lower() == "true"
+        self._client = httpx.AsyncClient(
+            base_url=self.base_url,
+            http2=use_http2,
+            timeout=httpx.Timeout(30.0),
+            limits=httpx.Limits(max_keepalive_connections=32, max_connections=max(64, max_in_flight)),
+        )
+
+    async def aclose(self) -> None:
+        """Release pooled connections."""
+        await self._client.aclose()
+
+    async def __aenter__(self) -> CxxtractHttpClient:
+        return self
+
+    async def __aexit__(self, *exc_info: Any) -> None:
+        await self.aclose()
 
     def _config_for(self, spec: ToolSpec) -> ToolClassConfig:
+        # Env overrides are read once per tool; they are fixed for the process lifetime.
+        cached = self._config_cache.get(spec.name)
+        if cached is not None:
+            return cached
         timeout_env = os.getenv(f"CXXTRACT_MCP_TIMEOUT_{spec.tool_class.upper()}", "").strip()
         retries_env = os.getenv(f"CXXTRACT_MCP_RETRIES_{spec.tool_class.upper()}", "").strip()
         base = DEFAULT_CLASS_CONFIG[spec.tool_class]
@@ -52,14 +91,29 @@ class CxxtractHttpClient:
         retries = int(retries_env) if retries_env else base.retries
         if spec.side_effectful and spec.method == "POST" and not self._allow_side_effect_retry:
             retries = 0
-        return ToolClassConfig(timeout_s=timeout_s, retries=max(0, retries))
+        config = ToolClassConfig(timeout_s=timeout_s, retries=max(0, retries))
+        self._config_cache[spec.name] = config
+        return config
 
     @staticmethod
-    def _format_path(path_template: str, path_values: dict[str, Any]) -> str:
-        path = path_template
-        for key, value in path_values.items():
-            path = path.replace("{" + key + "}", quote(str(value), safe=""))
-        return path
+    def _format_path(spec: ToolSpec, path_values: dict[str, Any]) -> str:
+        literals = spec.path_literals
+        if not spec.path_keys:
+            return literals[0]
+        parts = [literals[0]]
+        for index, key in enumerate(spec.path_keys, start=1):
+            parts.append(quote(str(path_values[key]), safe=""))
+            parts.append(literals[index])
+        return "".join(parts)
+
+    def _url_for(self, spec: ToolSpec, path_values: dict[str, Any]) -> str:
+        # Parameter-less paths resolve to one absolute URL, so httpx skips the base_url merge.
+        if spec.path_keys:
+            return self._format_path(spec, path_values)
+        url = self._url_cache.get(spec.name)
+        if url is None:
+            url = self._url_cache[spec.name] = f"{self.base_url}{spec.path}"
+        return url
 
     @staticmethod
     def _extract_error_code(detail: Any) -> str:
@@ -71,63 +125,84 @@ class CxxtractHttpClient:
             return detail
         return "http_error"
 
-    def call(
+    async def call(
         self,
         *,
         spec: ToolSpec,
         validated: dict[str, Any],
         request_id: str | int | None,
-    ) -> dict[str, Any]:
-        """Dispatch one validated tool call to service HTTP endpoint."""
+    ) -> Any:
+        """Dispatch one validated tool call to service HTTP endpoint.
+
+        Valid JSON success bodies are returned as the raw response ``bytes`` so
+        they are forwarded to the MCP client without a re-serialize round trip;
+        anything else is wrapped as ``{"raw": text}``.
+        """
         config = self._config_for(spec)
-        path = self._format_path(spec.path, validated.get("path", {}))
-        url = f"{self.base_url}{path}"
+        path = self._url_for(spec, validated.get("path", {}))
         params = validated.get("query") or None
         body = validated.get("body")
+        # Encode once up front; retries resend the same bytes.
+        if isinstance(body, BaseModel):
+            encoded_body: bytes | None = body.model_dump_json().encode("utf-8")
+        else:
+            encoded_body = orjson.dumps(body) if body is not None else None
 
         attempts = config.retries + 1
-        last_error: dict[str, Any] | None = None
+        last_error: dict[str, Any] = {
+            "http_status": 0,
+            "error_code": "",
+            "detail": "",
+            "tool_name": spec.name,
+            "request_id": request_id,
+            "attempt": 0,
+        }
 
         for attempt in range(1, attempts + 1):
+            last_error["attempt"] = attempt
             try:
-                with httpx.Client(timeout=config.timeout_s) as client:
+                async with self._slots:
                     if spec.method == "GET":
-                        resp = client.get(url, params=params)
+                        resp = await self._client.get(path, params=params, timeout=config.timeout_s)
                     else:
-                        resp = client.post(url, params=params, json=body)
+                        resp = await self._client.post(
+                            path,
+                            params=params,
+                            content=encoded_body,
+                            headers=_JSON_HEADERS,
+                            timeout=config.timeout_s,
+                        )
             except Exception as exc:
-                last_error = {
-                    "http_status": 0,
-                    "error_code": "transport_error",
-                    "detail": str(exc),
-                    "tool_name": spec.name,
-                    "request_id": request_id,
-                    "attempt": attempt,
-                }
+                last_error["http_status"] = 0
+                last_error["error_code"] = "transport_error"
+                last_error["detail"] = str(exc)
                 continue
 
+            is_json = resp.headers.get("content-type", "").startswith("application/json")
             if 200 <= resp.status_code < 300:
+                content = resp.content
+                if content and is_json:
+                    # Forwarded bytes are spliced unchecked into the JSON-RPC frame, so a
+                    # truncated or malformed body must not get through.
+                    try:
+                        orjson.loads(content)
+                    except orjson.JSONDecodeError:
+                        return {"raw": resp.text}
+                    return content
+                return {"raw": resp.text}
+
+            detail: Any = resp.text
+            if is_json:
                 try:
-                    return resp.json()
-                except Exception:
-                    return {"raw": resp.text}
+                    payload = orjson.loads(resp.content)
+                except orjson.JSONDecodeError:
+                    pass
+                else:
+                    detail = payload.get("detail", payload) if isinstance(payload, dict) else payload
+
+            last_error["http_status"] = int(resp.status_code)
+            last_error["error_code"] = self._extract_error_code(detail)
+            last_error["detail"] = detail
 
-            detail: Any = ""
-            try:
-                payload = resp.json()
-                detail = payload.get("detail", payload)
-            except Exception:
-                detail = resp.text
-
-            last_error = {
-                "http_status": int(resp.status_code),
-                "error_code": self._extract_error_code(detail),
-                "detail": detail,
-                "tool_name": spec.name,
-                "request_id": request_id,
-                "attempt": attempt,
-            }
-
-        assert last_error is not None
         raise HttpToolError(last_error)
 
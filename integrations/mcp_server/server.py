@@ -2,45 +2,110 @@
 
 from __future__ import annotations
 
-import json
+import asyncio
+import os
 import sys
-from typing import Any
+from typing import Any, Awaitable, Callable
+
+import orjson
 
 from integrations.mcp_server.http_client import CxxtractHttpClient, HttpToolError
-from integrations.mcp_server.tool_registry import TOOL_SPECS, export_mcp_tool_definition, get_tool_spec, validate_arguments
+from integrations.mcp_server.tool_registry import get_tool_spec, get_tools_list_json, validate_arguments
 
 SERVER_NAME = "cxxtract-mcp-server"
 SERVER_VERSION = "0.1.0"
 
+# TOOL_SPECS is immutable, so the tools/list payload is serialized once per process
+# and spliced into every response verbatim.
+_TOOLS_LIST_RESULT: dict[str, Any] = {"tools": orjson.Fragment(get_tools_list_json())}
+
+
+_READ_CHUNK = 65536
+
+# Bytes read from stdin but not yet consumed as a frame.
+_inbuf = bytearray()
+
+
+def _read_chunk() -> bytes:
+    try:
+        fd = sys.stdin.fileno()
+    except (AttributeError, OSError, ValueError):
+        return sys.stdin.buffer.read1(_READ_CHUNK)
+    return os.read(fd, _READ_CHUNK)
+
+
+def _header_end(buf: bytearray) -> tuple[int, int] | None:
+    crlf = buf.find(b"\r\n\r\n")
+    lf = buf.find(b"\n\n")
+    if crlf < 0 and lf < 0:
+        return None
+    if lf < 0 or 0 <= crlf < lf:
+        return crlf, 4
+    return lf, 2
+
 
 def _read_message() -> dict[str, Any] | None:
     """Read one content-length framed JSON-RPC message from stdin."""
-    content_length = 0
-    while True:
-        line = sys.stdin.buffer.readline()
-        if not line:
+    while (found := _header_end(_inbuf)) is None:
+        chunk = _read_chunk()
+        if not chunk:
             return None
-        text = line.decode("utf-8", errors="replace").strip()
-        if not text:
-            break
-        if text.lower().startswith("content-length:"):
-            content_length = int(text.split(":", 1)[1].strip())
+        _inbuf.extend(chunk)
 
+    end, sep_len = found
+    content_length = 0
+    for line in _inbuf[:end].split(b"\n"):
+        line = line.strip()
+        if line[:15].lower() == b"content-length:":
+            content_length = int(line[15:])
     if content_length <= 0:
         return None
-    payload = sys.stdin.buffer.read(content_length)
-    if not payload:
+
+    start = end + sep_len
+    stop = start + content_length
+    while len(_inbuf) < stop:
+        chunk = _read_chunk()
+        if not chunk:
+            return None
+        _inbuf.extend(chunk)
+
+    try:
+        with memoryview(_inbuf) as view:
+            return orjson.loads(view[start:stop])
+    finally:
+        del _inbuf[:stop]
+
+
+def _stdout_fd() -> int | None:
+    if not hasattr(os, "writev"):
         return None
-    return json.loads(payload.decode("utf-8"))
+    try:
+        return sys.stdout.fileno()
+    except (AttributeError, OSError, ValueError):
+        return None
+
+
+def _writev_all(fd: int, buffers: list[bytes | memoryview]) -> None:
+    while buffers:
+        written = os.writev(fd, buffers)
+        while buffers and written >= len(buffers[0]):
+            written -= len(buffers.pop(0))
+        if written:
+            buffers[0] = memoryview(buffers[0])[written:]
 
 
 def _write_message(payload: dict[str, Any]) -> None:
     """Write one content-length framed JSON-RPC message to stdout."""
-    body = json.dumps(payload, ensure_ascii=False).encode("utf-8")
-    header = f"Content-Length: {len(body)}\r\n\r\n".encode("utf-8")
-    sys.stdout.buffer.write(header)
-    sys.stdout.buffer.write(body)
-    sys.stdout.buffer.flush()
+    body = orjson.dumps(payload)
+    header = b"Content-Length: %d\r\n\r\n" % len(body)
+    fd = _stdout_fd()
+    if fd is not None:
+        # One vectored syscall on the raw fd; nothing else writes to stdout.
+        _writev_all(fd, [header, body])
+        return
+    out = sys.stdout.buffer
+    out.write(header + body)
+    out.flush()
 
 
 def _result(request_id: str | int | None, result: Any) -> dict[str, Any]:
@@ -55,15 +120,19 @@ def _error(request_id: str | int | None, code: int, message: str, data: Any = No
 
 
 def _tool_result(data: Any, *, is_error: bool = False) -> dict[str, Any]:
-    text = json.dumps(data, ensure_ascii=False, indent=2)
+    # Serialize once: the text mirror and structuredContent share the same bytes,
+    # and the Fragment is spliced verbatim when the response frame is written.
+    # Raw JSON bytes from the HTTP client (already validated there) are used as-is,
+    # so every text block, success or error, is compact JSON.
+    raw = data if isinstance(data, bytes) else orjson.dumps(data)
     return {
         "isError": is_error,
-        "content": [{"type": "text", "text": text}],
-        "structuredContent": data,
+        "content": [{"type": "text", "text": raw.decode("utf-8")}],
+        "structuredContent": orjson.Fragment(raw),
     }
 
 
-def _handle_tools_call(client: CxxtractHttpClient, request: dict[str, Any]) -> dict[str, Any]:
+async def _handle_tools_call(client: CxxtractHttpClient, request: dict[str, Any]) -> dict[str, Any]:
     request_id = request.get("id")
     params = request.get("params", {})
     name = params.get("name")
@@ -76,7 +145,7 @@ def _handle_tools_call(client: CxxtractHttpClient, request: dict[str, Any]) -> d
 
     raw_args = params.get("arguments", {})
     try:
-        validated = validate_arguments(spec, raw_args if isinstance(raw_args, dict) else None)
+        validated = validate_arguments(spec, raw_args if isinstance(raw_args, dict) else None, dump_body=False)
     except Exception as exc:
         return _result(request_id, _tool_result(
             {
@@ -90,7 +159,7 @@ def _handle_tools_call(client: CxxtractHttpClient, request: dict[str, Any]) -> d
         ))
 
     try:
-        data = client.call(spec=spec, validated=validated, request_id=request_id)
+        data = await client.call(spec=spec, validated=validated, request_id=request_id)
     except HttpToolError as exc:
         return _result(request_id, _tool_result(exc.envelope, is_error=True))
     except Exception as exc:
@@ -108,41 +177,76 @@ def _handle_tools_call(client: CxxtractHttpClient, request: dict[str, Any]) -> d
     return _result(request_id, _tool_result(data, is_error=False))
 
 
-def _handle_request(client: CxxtractHttpClient, request: dict[str, Any]) -> dict[str, Any] | None:
-    request_id = request.get("id")
+async def _handle_initialize(client: CxxtractHttpClient, request: dict[str, Any]) -> dict[str, Any]:
+    return _result(
+        request.get("id"),
+        {
+            "protocolVersion": "2024-11-05",
+            "capabilities": {"tools": {}},
+            "serverInfo": {"name": SERVER_NAME, "version": SERVER_VERSION},
+        },
+    )
+
+
+async def _handle_tools_list(client: CxxtractHttpClient, request: dict[str, Any]) -> dict[str, Any]:
+    return _result(request.get("id"), _TOOLS_LIST_RESULT)
+
+
+async def _handle_notification(client: CxxtractHttpClient, request: dict[str, Any]) -> None:
+    return None
+
+
+_Handler = Callable[[CxxtractHttpClient, dict[str, Any]], Awaitable[dict[str, Any] | None]]
+
+_HANDLERS: dict[str, _Handler] = {
+    "initialize": _handle_initialize,
+    "notifications/initialized": _handle_notification,
+    "tools/list": _handle_tools_list,
+    "tools/call": _handle_tools_call,
+}
+
+
+async def _handle_request(client: CxxtractHttpClient, request: dict[str, Any]) -> dict[str, Any] | None:
     method = request.get("method", "")
+    handler = _HANDLERS.get(method) if isinstance(method, str) else None
+    if handler is None:
+        return _error(request.get("id"), -32601, f"method not found: {method}")
+    return await handler(client, request)
 
-    if method == "initialize":
-        return _result(
-            request_id,
-            {
-                "protocolVersion": "2024-11-05",
-                "capabilities": {"tools": {}},
-                "serverInfo": {"name": SERVER_NAME, "version": SERVER_VERSION},
-            },
-        )
-    if method == "notifications/initialized":
-        return None
-    if method == "tools/list":
-        tools = [export_mcp_tool_definition(spec) for spec in TOOL_SPECS]
-        return _result(request_id, {"tools": tools})
-    if method == "tools/call":
-        return _handle_tools_call(client, request)
-    return _error(request_id, -32601, f"method not found: {method}")
+
+async def _dispatch(client: CxxtractHttpClient, request: dict[str, Any]) -> None:
+    try:
+        response = await _handle_request(client, request)
+    except Exception as exc:
+        response = _error(request.get("id"), -32000, "server_error", {"detail": str(exc)})
+    if response is not None:
+        # Writes happen on the event loop thread with no await in between, so
+        # concurrently completing tasks never interleave frames on stdout.
+        _write_message(response)
+
+
+async def _serve() -> None:
+    pending: set[asyncio.Task[None]] = set()
+    async with CxxtractHttpClient() as client:
+        while True:
+            # Blocking stdin reads stay off the event loop (portable to Windows pipes).
+            try:
+                request = await asyncio.to_thread(_read_message)
+            except orjson.JSONDecodeError as exc:
+                # The bad frame is already consumed; report it and keep serving.
+                _write_message(_error(None, -32700, "parse error", {"detail": str(exc)}))
+                continue
+            if request is None:
+                break
+            task = asyncio.create_task(_dispatch(client, request))
+            pending.add(task)
+            task.add_done_callback(pending.discard)
+        if pending:
+            await asyncio.gather(*pending)
 
 
 def main() -> None:
-    client = CxxtractHttpClient()
-    while True:
-        request = _read_message()
-        if request is None:
-            break
-        try:
-            response = _handle_request(client, request)
-        except Exception as exc:
-            response = _error(request.get("id"), -32000, "server_error", {"detail": str(exc)})
-        if response is not None:
-            _write_message(response)
+    asyncio.run(_serve())
 
 
 if __name__ == "__main__":
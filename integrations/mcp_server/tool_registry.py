@@ -2,10 +2,21 @@
 
 from __future__ import annotations
 
+import copy
+import hashlib
+import re
+import sys
 from dataclasses import dataclass
+from collections.abc import Iterator
+from functools import lru_cache
+from itertools import compress
+from pathlib import Path
 from typing import Any, Literal
 
+import orjson
+import pydantic
 from pydantic import BaseModel
+from pydantic.json_schema import models_json_schema
 
 from cxxtract.models import (
     CacheInvalidateRequest,
@@ -63,7 +74,7 @@ from cxxtract.models import (
 ToolClass = Literal["aggregated", "atomic", "operational"]
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class ToolSpec:
     """Canonical definition for one agent-facing tool."""
 
@@ -80,6 +91,12 @@ class ToolSpec:
     response_model: type[BaseModel] | None = None
     path_params: tuple[str, ...] = ()
     query_params: tuple[str, ...] = ()
+    path_literals: tuple[str, ...] = ()
+    path_keys: tuple[str, ...] = ()
+    routed_params: frozenset[str] = frozenset()
+
+
+_PATH_PARAM_RE = re.compile(r"\{(\w+)\}")
 
 
 def _spec(
@@ -98,8 +115,12 @@ def _spec(
     path_params: tuple[str, ...] = (),
     query_params: tuple[str, ...] = (),
 ) -> ToolSpec:
+    # Pre-split "/a/{x}/b" into literals ("/a/", "/b") and keys ("x",) so
+    # per-call path formatting is a single join. Names and keys are interned so
+    # dict lookups against path_params hit the identity fast path.
+    segments = _PATH_PARAM_RE.split(path)
     return ToolSpec(
-        name=name,
+        name=sys.intern(name),
         method=method,
         path=path,
         group=group,
@@ -112,6 +133,9 @@ def _spec(
         response_model=response_model,
         path_params=path_params,
         query_params=query_params,
+        path_literals=tuple(segments[0::2]),
+        path_keys=tuple(sys.intern(key) for key in segments[1::2]),
+        routed_params=frozenset(path_params) | frozenset(query_params),
     )
 
 
@@ -515,102 +539,146 @@ TOOL_SPECS: tuple[ToolSpec, ...] = (
 COMMON_COMPONENT_MODELS: tuple[type[BaseModel], ...] = ()
 
 
+_SPEC_BY_NAME: dict[str, ToolSpec] = {spec.name: spec for spec in TOOL_SPECS}
+_ROUTE_INVENTORY: frozenset[tuple[str, str]] = frozenset((spec.method, spec.path) for spec in TOOL_SPECS)
+# Parallel flag column over TOOL_SPECS, so side-effect scans filter in C
+# without touching every spec.
+_SIDE_EFFECT_MASK: tuple[bool, ...] = tuple(spec.side_effectful for spec in TOOL_SPECS)
+
+
 def get_tool_spec(name: str) -> ToolSpec | None:
     """Return tool spec by canonical name."""
-    for spec in TOOL_SPECS:
-        if spec.name == name:
-            return spec
-    return None
+    return _SPEC_BY_NAME.get(name)
+
+
+def iter_side_effectful() -> Iterator[ToolSpec]:
+    """Yield side-effectful tool specs in registry order."""
+    return compress(TOOL_SPECS, _SIDE_EFFECT_MASK)
+
+
+@lru_cache(maxsize=None)
+def _model_schema(model: type[BaseModel], ref_template: str) -> dict[str, Any]:
+    # Shared cache entry: callers must copy before mutating.
+    return model.model_json_schema(ref_template=ref_template)
+
+
+# Path/query names come from a small closed set, so each param schema is built
+# once on first use and shared by every cached input schema (public callers get
+# deep copies).
+_PARAM_SCHEMAS: dict[str, dict[str, Any]] = {}
+
+_INCLUDE_EMBEDDING_SCHEMA: dict[str, Any] = {
+    "type": "boolean",
+    "default": False,
+    "description": "Include embedding values in vector.get response when true.",
+}
 
 
 def _get_path_or_query_param_schema(name: str) -> dict[str, Any]:
+    cached = _PARAM_SCHEMAS.get(name)
+    if cached is not None:
+        return cached
     if name == "include_embedding":
-        return {
-            "type": "boolean",
-            "default": False,
-            "description": "Include embedding values in vector.get response when true.",
+        cached = _INCLUDE_EMBEDDING_SCHEMA
+    else:
+        cached = {
+            "type": "string",
+            "minLength": 1,
+            "description": f"{name} path/query parameter.",
         }
-    return {
-        "type": "string",
-        "minLength": 1,
-        "description": f"{name} path/query parameter.",
-    }
+    _PARAM_SCHEMAS[name] = cached
+    return cached
+
+
+_BASE_SCHEMA_TEMPLATE: dict[str, Any] = {
+    "$schema": "https://json-schema.org/draft/2020-12/schema",
+    "type": "object",
+    "additionalProperties": False,
+}
 
 
 def _base_input_schema(spec: ToolSpec) -> dict[str, Any]:
-    return {
-        "$schema": "https://json-schema.org/draft/2020-12/schema",
-        "type": "object",
-        "additionalProperties": False,
-        "properties": {},
-        "required": [],
-        "x-tool-class": spec.tool_class,
-        "x-side-effectful": spec.side_effectful,
-    }
+    schema = _BASE_SCHEMA_TEMPLATE.copy()
+    schema["properties"] = {}
+    schema["required"] = []
+    schema["x-tool-class"] = spec.tool_class
+    schema["x-side-effectful"] = spec.side_effectful
+    return schema
 
 
 def get_input_schema(spec: ToolSpec) -> dict[str, Any]:
     """Build the tool input JSON schema for MCP/function definitions."""
+    return copy.deepcopy(_input_schema(spec))
+
+
+@lru_cache(maxsize=None)
+def _input_schema(spec: ToolSpec) -> dict[str, Any]:
+    # Specs are frozen, so each schema is generated once; public callers get a copy.
     schema = _base_input_schema(spec)
     properties = schema["properties"]
-    required = set(schema["required"])
+    # Ordered set: path params first, then model fields in Pydantic's order.
+    required: dict[str, None] = {}
 
     for param in spec.path_params:
         properties[param] = _get_path_or_query_param_schema(param)
-        required.add(param)
+        required[param] = None
     for param in spec.query_params:
         properties[param] = _get_path_or_query_param_schema(param)
 
     if spec.request_model is not None:
-        model_schema = spec.request_model.model_json_schema(ref_template="#/$defs/{model}")
+        model_schema = _model_schema(spec.request_model, "#/$defs/{model}")
         defs = model_schema.get("$defs")
         if isinstance(defs, dict) and defs:
             schema["$defs"] = defs
         for key, value in model_schema.get("properties", {}).items():
             properties[key] = value
         for key in model_schema.get("required", []):
-            required.add(key)
+            required.setdefault(key, None)
         if model_schema.get("description"):
             schema["description"] = model_schema["description"]
 
-    schema["required"] = sorted(required)
-    if not schema["required"]:
+    if required:
+        schema["required"] = list(required)
+    else:
         schema.pop("required")
     return schema
 
 
-def _description_for_tool_class(spec: ToolSpec) -> str:
-    if spec.tool_class == "aggregated":
-        return (
-            "When to use: Prefer this fast-track aggregated tool when the target symbol/function is already known and "
-            "you want a direct answer in one round trip.\n"
-            "When not to use: Avoid this when symbol identity is uncertain or you need explicit stepwise evidence "
-            "and bounded intermediate costs; use `cxxtract.explore.*` tools instead."
-        )
-    if spec.tool_class == "atomic":
-        return (
-            "When to use: Use this atomic tool in iterative exploration chains to control recall, freshness, parsing, "
-            "and semantic verification step-by-step with explicit evidence and bounded Cost/Coverage envelopes.\n"
-            "When not to use: Avoid this for simple known-symbol lookups where a `cxxtract.query.*` fast-track tool "
-            "can answer directly with lower orchestration overhead."
-        )
-    return (
+_CLASS_DESCRIPTIONS: dict[ToolClass, str] = {
+    "aggregated": (
+        "When to use: Prefer this fast-track aggregated tool when the target symbol/function is already known and "
+        "you want a direct answer in one round trip.\n"
+        "When not to use: Avoid this when symbol identity is uncertain or you need explicit stepwise evidence "
+        "and bounded intermediate costs; use `cxxtract.explore.*` tools instead."
+    ),
+    "atomic": (
+        "When to use: Use this atomic tool in iterative exploration chains to control recall, freshness, parsing, "
+        "and semantic verification step-by-step with explicit evidence and bounded Cost/Coverage envelopes.\n"
+        "When not to use: Avoid this for simple known-symbol lookups where a `cxxtract.query.*` fast-track tool "
+        "can answer directly with lower orchestration overhead."
+    ),
+    "operational": (
         "When to use: Use this operational tool only when workspace/context/cache/sync/vector state actions are "
         "explicitly intended by the task.\n"
         "When not to use: Avoid for pure read-only semantic analysis unless this exact operational state/control "
         "operation is required."
-    )
+    ),
+}
+
+_SIDE_EFFECT_CAUTION = (
+    "\nSide effects: This tool mutates service/workspace state. Call only with explicit intent and include "
+    "clear rationale in your plan."
+)
 
 
+def _description_for_tool_class(spec: ToolSpec) -> str:
+    return _CLASS_DESCRIPTIONS[spec.tool_class]
+
+
+@lru_cache(maxsize=None)
 def build_tool_description(spec: ToolSpec) -> str:
     """Build detailed, agent-friendly description text."""
-    caution = ""
-    if spec.side_effectful:
-        caution = (
-            "\nSide effects: This tool mutates service/workspace state. Call only with explicit intent and include "
-            "clear rationale in your plan."
-        )
-
+    caution = _SIDE_EFFECT_CAUTION if spec.side_effectful else ""
     response_name = spec.response_model.__name__ if spec.response_model is not None else "object"
     return (
         f"What this tool does: {spec.what}\n"
@@ -621,8 +689,17 @@ def build_tool_description(spec: ToolSpec) -> str:
     )
 
 
-def validate_arguments(spec: ToolSpec, arguments: dict[str, Any] | None) -> dict[str, Any]:
-    """Validate raw tool arguments and return normalized path/query/body buckets."""
+def validate_arguments(
+    spec: ToolSpec,
+    arguments: dict[str, Any] | None,
+    *,
+    dump_body: bool = True,
+) -> dict[str, Any]:
+    """Validate raw tool arguments and return normalized path/query/body buckets.
+
+    Request-model bodies are returned as JSON dicts; pass ``dump_body=False``
+    to get the validated model instance so the transport serializes it once.
+    """
     args = arguments or {}
     if not isinstance(args, dict):
         raise ValueError("arguments must be a JSON object")
@@ -647,8 +724,8 @@ def validate_arguments(spec: ToolSpec, arguments: dict[str, Any] | None) -> dict
         else:
             raise ValueError(f"invalid query parameter: {key}")
 
-    excluded = set(spec.path_params) | set(spec.query_params)
-    body_input = {k: v for k, v in args.items() if k not in excluded}
+    routed = spec.routed_params
+    body_input = {k: v for k, v in args.items() if k not in routed} if routed else args
 
     if spec.method == "GET":
         if body_input:
@@ -662,19 +739,23 @@ def validate_arguments(spec: ToolSpec, arguments: dict[str, Any] | None) -> dict
             raise ValueError(f"unexpected body fields: {unknown}")
         return {"path": path_values, "query": query_values, "body": {}}
 
-    validated_body = spec.request_model.model_validate(body_input).model_dump(
-        mode="json",
-        exclude_none=False,
-    )
+    validated_body: BaseModel | dict[str, Any] = spec.request_model.model_validate(body_input)
+    if dump_body:
+        validated_body = validated_body.model_dump(mode="json", exclude_none=False)
     return {"path": path_values, "query": query_values, "body": validated_body}
 
 
 def export_mcp_tool_definition(spec: ToolSpec) -> dict[str, Any]:
     """Convert a ToolSpec into MCP tools/list shape."""
+    return copy.deepcopy(_export_cached(spec))
+
+
+@lru_cache(maxsize=None)
+def _export_cached(spec: ToolSpec) -> dict[str, Any]:
     return {
         "name": spec.name,
         "description": build_tool_description(spec),
-        "inputSchema": get_input_schema(spec),
+        "inputSchema": _input_schema(spec),
         "x-tool-class": spec.tool_class,
         "x-side-effectful": spec.side_effectful,
         "x-http": {"method": spec.method, "path": spec.path},
@@ -689,8 +770,76 @@ def export_mcp_tool_definition(spec: ToolSpec) -> dict[str, Any]:
     }
 
 
+# Written by scripts/generate_agent_artifacts.py; kept in sync by CI validation.
+_PREBUILT_TOOLS_CATALOG = Path(__file__).with_name("tools.catalog.json")
+
+
+@lru_cache(maxsize=1)
+def registry_fingerprint() -> str | None:
+    """Return a digest of the sources the exported tool definitions derive from.
+
+    Covers this module and the modules defining request/response models, so it
+    is cheap to compute without generating schemas. Returns None when any of
+    those sources cannot be read (e.g. a module loaded without ``__file__``).
+    """
+    modules = {__name__}
+    for spec in TOOL_SPECS:
+        for model in (spec.request_model, spec.response_model):
+            if model is not None:
+                modules.add(model.__module__)
+    digest = hashlib.sha256()
+    for module in sorted(modules):
+        source = getattr(sys.modules.get(module), "__file__", None)
+        if not source:
+            return None
+        try:
+            data = Path(source).read_bytes()
+        except OSError:
+            return None
+        # Normalise line endings so CRLF checkouts match the committed catalog.
+        digest.update(data.replace(b"\r\n", b"\n"))
+    return digest.hexdigest()
+
+
+def _load_prebuilt_tools() -> list[Any] | None:
+    try:
+        catalog = orjson.loads(_PREBUILT_TOOLS_CATALOG.read_bytes())
+    except (OSError, orjson.JSONDecodeError):
+        return None
+    if not isinstance(catalog, dict):
+        return None
+    fingerprint = registry_fingerprint()
+    if fingerprint is None or catalog.get("fingerprint") != fingerprint:
+        return None
+    # Schema output can shift between Pydantic releases; regenerate rather than fail.
+    if catalog.get("pydantic_version") != pydantic.VERSION:
+        return None
+    tools = catalog.get("tools")
+    return tools if isinstance(tools, list) else None
+
+
+@lru_cache(maxsize=1)
+def get_tools_list_json() -> bytes:
+    """Return the serialized MCP tools/list ``tools`` array for all specs.
+
+    Served from the generated ``tools.catalog.json`` when its fingerprint
+    matches :func:`registry_fingerprint` and it was generated with the
+    installed Pydantic version, so server start-up skips Pydantic schema
+    generation. Otherwise falls back to live generation.
+    """
+    tools = _load_prebuilt_tools()
+    if tools is None:
+        tools = [_export_cached(spec) for spec in TOOL_SPECS]
+    return orjson.dumps(tools)
+
+
 def collect_model_classes() -> list[type[BaseModel]]:
     """Collect request/response/common model classes used by registry."""
+    return list(_model_classes())
+
+
+@lru_cache(maxsize=1)
+def _model_classes() -> tuple[type[BaseModel], ...]:
     seen: dict[str, type[BaseModel]] = {}
     for spec in TOOL_SPECS:
         for model in (spec.request_model, spec.response_model):
@@ -699,27 +848,26 @@ def collect_model_classes() -> list[type[BaseModel]]:
             seen[model.__name__] = model
     for model in COMMON_COMPONENT_MODELS:
         seen[model.__name__] = model
-    return [seen[k] for k in sorted(seen.keys())]
+    return tuple(seen[k] for k in sorted(seen.keys()))
 
 
 def collect_component_schemas() -> dict[str, Any]:
     """Collect JSON schemas for all referenced models with flattened defs."""
-    components: dict[str, Any] = {}
+    return copy.deepcopy(_component_schemas())
 
-    def add_model(model: type[BaseModel]) -> None:
-        schema = model.model_json_schema(ref_template="#/components/schemas/{model}")
-        defs = schema.pop("$defs", {})
-        if isinstance(defs, dict):
-            for key, value in defs.items():
-                components.setdefault(key, value)
-        components[model.__name__] = schema
 
-    for model in collect_model_classes():
-        add_model(model)
-    return components
+@lru_cache(maxsize=1)
+def _component_schemas() -> dict[str, Any]:
+    # One generator pass over every model, so shared nested types are expanded
+    # once and land alongside the top-level models in a single $defs map.
+    _, top_level = models_json_schema(
+        [(model, "validation") for model in _model_classes()],
+        ref_template="#/components/schemas/{model}",
+    )
+    return top_level.get("$defs", {})
 
 
-def route_inventory() -> set[tuple[str, str]]:
+def route_inventory() -> frozenset[tuple[str, str]]:
     """Return (METHOD, PATH) inventory from specs."""
-    return {(spec.method, spec.path) for spec in TOOL_SPECS}
+    return _ROUTE_INVENTORY
 
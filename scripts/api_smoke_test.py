@@ -6,55 +6,115 @@ Examples:
   python scripts/api_smoke_test.py --base-url http://127.0.0.1:8000 \
     --workspace-id ws_main --root-path F:/dev/ws_main --manifest-path F:/dev/ws_main/workspace.yaml
   python scripts/api_smoke_test.py --tests health,workspace_register,query_references
+  python scripts/api_smoke_test.py --concurrency 8 --root-path ... --manifest-path ...
 """
 
 from __future__ import annotations
 
 import argparse
-import json
+import functools
 import sys
-import urllib.error
+import threading
+import time
 import urllib.parse
-import urllib.request
-from dataclasses import dataclass
+from collections import Counter
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
 from pathlib import Path
 from typing import Any, Callable
 
+import httpx
+import orjson
 import yaml
 
+try:
+    from yaml import CSafeLoader as _YamlLoader
+except ImportError:  # PyYAML built without libyaml
+    from yaml import SafeLoader as _YamlLoader
+
+
+_TERMINAL_JOB_STATUSES = frozenset({"done", "failed", "dead_letter"})
+
+# Ordering constraints for --concurrency > 1. Shared setup is already serialized by
+# the ensure_* helpers; these keep tests that mutate or expire that state from
+# racing the tests that read it. Only enforced when both names are selected.
+_TEST_DEPENDS_ON: dict[str, frozenset[str]] = {
+    "workspace_get": frozenset({"workspace_register"}),
+    "workspace_refresh": frozenset({"workspace_register", "workspace_get"}),
+    "context_expire": frozenset({"context_create_overlay"}),
+    "cache_invalidate": frozenset(
+        {
+            "query_references",
+            "query_definition",
+            "query_call_graph",
+            "query_file_symbols",
+            "explore_fetch_call_edges",
+            "explore_classify_freshness",
+            "explore_fetch_references",
+            "explore_get_confidence",
+            "agent_call_graph_flow",
+        }
+    ),
+    "sync_job_get": frozenset({"sync_repo"}),
+    "vector_search": frozenset({"vector_upsert"}),
+    "vector_get": frozenset({"vector_upsert"}),
+}
+
 
 @dataclass
 class ApiClient:
     base_url: str
     timeout_s: float = 20.0
+    http2: bool = False
+    _http: httpx.Client = field(init=False, repr=False)
+
+    def __post_init__(self) -> None:
+        self.base_url = self.base_url.rstrip("/")
+        # One pooled client so every probe reuses the same keep-alive connection.
+        # With http2 (needs the ``http2`` extra and an h2-capable TLS endpoint),
+        # concurrent probes multiplex as streams over a single connection.
+        self._http = httpx.Client(
+            http2=self.http2,
+            timeout=self.timeout_s,
+            headers={"Accept": "application/json"},
+        )
 
-    def _request(self, method: str, path: str, payload: dict[str, Any] | None = None) -> tuple[int, Any]:
-        url = f"{self.base_url.rstrip('/')}{path}"
+    def close(self) -> None:
+        self._http.close()
+
+    def _request(
+        self,
+        method: str,
+        path: str,
+        payload: dict[str, Any] | bytes | None = None,
+        *,
+        parse_body: bool = True,
+    ) -> tuple[int, Any]:
+        if not path.startswith("/"):
+            raise ValueError(f"request path must start with '/': {path!r}")
+        url = self.base_url + path
         data: bytes | None = None
-        headers = {"Accept": "application/json"}
+        headers: dict[str, str] = {}
         if payload is not None:
-            data = json.dumps(payload).encode("utf-8")
+            data = payload if isinstance(payload, bytes) else orjson.dumps(payload)
             headers["Content-Type"] = "application/json"
 
-        req = urllib.request.Request(url=url, data=data, method=method.upper(), headers=headers)
+        resp = self._http.request(method.upper(), url, content=data, headers=headers)
+        if resp.is_success and not parse_body:
+            # Caller only checks the status; error bodies are still parsed for messages.
+            return resp.status_code, None
+        raw = resp.content
         try:
-            with urllib.request.urlopen(req, timeout=self.timeout_s) as resp:
-                raw = resp.read().decode("utf-8", errors="replace")
-                body = json.loads(raw) if raw else {}
-                return int(resp.status), body
-        except urllib.error.HTTPError as exc:
-            raw = exc.read().decode("utf-8", errors="replace")
-            try:
-                body = json.loads(raw) if raw else {}
-            except json.JSONDecodeError:
-                body = {"raw": raw}
-            return int(exc.code), body
+            body = orjson.loads(raw) if raw else {}
+        except orjson.JSONDecodeError:
+            body = {"raw": raw.decode("utf-8", errors="replace")}
+        return resp.status_code, body
 
-    def get(self, path: str) -> tuple[int, Any]:
-        return self._request("GET", path, None)
+    def get(self, path: str, *, parse_body: bool = True) -> tuple[int, Any]:
+        return self._request("GET", path, None, parse_body=parse_body)
 
-    def post(self, path: str, payload: dict[str, Any]) -> tuple[int, Any]:
-        return self._request("POST", path, payload)
+    def post(self, path: str, payload: dict[str, Any] | bytes, *, parse_body: bool = True) -> tuple[int, Any]:
+        return self._request("POST", path, payload, parse_body=parse_body)
 
 
 @dataclass
@@ -64,11 +124,44 @@ class TestResult:
     message: str
 
 
+def _smoke_test(fn: Callable[[SmokeRunner, str], TestResult]) -> Callable[[SmokeRunner], TestResult]:
+    """Run a ``test_<name>`` method under ``<name>``, reporting any exception as a failure."""
+    name = fn.__name__.removeprefix("test_")
+
+    @functools.wraps(fn)
+    def run(self: SmokeRunner) -> TestResult:
+        try:
+            return fn(self, name)
+        except Exception as exc:
+            return self._fail(name, str(exc))
+
+    return run
+
+
 class SmokeRunner:
     def __init__(self, args: argparse.Namespace) -> None:
         self.args = args
-        self.client = ApiClient(args.base_url, args.timeout_s)
+        self.client = ApiClient(args.base_url, args.timeout_s, http2=args.http2)
         self.state: dict[str, Any] = {}
+        # Response dumps are buffered and written once by main(), so concurrent
+        # tests never interleave partial output on stdout.
+        self.output: list[str] = []
+        # Success bodies that are only echoed by --print-response are not parsed otherwise.
+        self._dump_bodies = bool(args.print_response)
+        # Identifiers are fixed for the run, so quote them once.
+        self._workspace_q = urllib.parse.quote(args.workspace_id)
+        self._repo_q = urllib.parse.quote(args.repo_id)
+        self._workspace_prefix = f"/workspace/{self._workspace_q}"
+        self._vector_record = (args.repo_id or "repoA", args.commit_sha or ("a" * 40))
+        self._vector_record_path = "/commit-diff-summaries/" + "/".join(
+            urllib.parse.quote(part) for part in (args.workspace_id, *self._vector_record)
+        )
+        # Every /query/* and list-candidates call shares this base; callers that add
+        # fields copy it with {**base, ...}, and the plain ones send the bytes.
+        self._query_base = self._build_query_payload()
+        self._query_body = orjson.dumps(self._query_base)
+        # Guards the shared ensure_* setup when tests run concurrently.
+        self._state_lock = threading.RLock()
 
         self.tests: list[tuple[str, Callable[[], TestResult]]] = [
             ("health", self.test_health),
@@ -100,6 +193,7 @@ class SmokeRunner:
             ("vector_search", self.test_vector_search),
             ("vector_get", self.test_vector_get),
         ]
+        self._tests_by_name: dict[str, Callable[[], TestResult]] = dict(self.tests)
 
     def _entry_repos(self) -> list[str]:
         raw = (self.args.entry_repos or "").strip()
@@ -107,10 +201,10 @@ class SmokeRunner:
             return []
         return [x.strip() for x in raw.split(",") if x.strip()]
 
-    def _query_payload_base(self, symbol: str) -> dict[str, Any]:
+    def _build_query_payload(self) -> dict[str, Any]:
         payload: dict[str, Any] = {
             "workspace_id": self.args.workspace_id,
-            "symbol": symbol,
+            "symbol": self.args.symbol,
             "scope": {
                 "entry_repos": self._entry_repos(),
                 "max_repo_hops": self.args.max_repo_hops,
@@ -142,14 +236,33 @@ class SmokeRunner:
     def _dump_response(self, test_name: str, body: Any) -> None:
         if not self.args.print_response:
             return
-        print(f"[RESPONSE] {test_name}")
         try:
-            print(json.dumps(body, ensure_ascii=False, indent=2))
+            rendered = orjson.dumps(body, option=orjson.OPT_INDENT_2).decode("utf-8")
         except Exception:
-            print(str(body))
+            rendered = str(body)
+        self.output.append(f"[RESPONSE] {test_name}\n{rendered}")
+
+    def _zero_embedding(self) -> orjson.Fragment:
+        # Upsert and search send the same zero vector; encode it once per run and
+        # let orjson splice the bytes into each body.
+        with self._state_lock:
+            cached = self.state.get("zero_embedding")
+            if cached is None:
+                cached = orjson.Fragment(orjson.dumps([0.0] * self.args.embedding_dim))
+                self.state["zero_embedding"] = cached
+            return cached
+
+    def _get_health(self) -> tuple[int, Any]:
+        # health and rg_basic both read /health; one probe per run is enough.
+        with self._state_lock:
+            cached = self.state.get("health")
+            if cached is None:
+                cached = self.client.get("/health")
+                self.state["health"] = cached
+            return cached
 
     def _workspace_path(self) -> str:
-        return f"/workspace/{urllib.parse.quote(self.args.workspace_id)}"
+        return self._workspace_prefix
 
     def _rg_search_payload(self) -> dict[str, Any]:
         return {
@@ -157,10 +270,8 @@ class SmokeRunner:
             "query": self.args.rg_query,
             "mode": self.args.rg_mode,
             "analysis_context": {"mode": "baseline"},
-            "scope": {
-                "entry_repos": self._entry_repos(),
-                "max_repo_hops": self.args.max_repo_hops,
-            },
+            # Same scope as the query payload; shared, never mutated.
+            "scope": self._query_base["scope"],
             "max_hits": self.args.rg_max_hits,
             "max_files": self.args.max_recall_files or 50,
             "timeout_s": self.args.rg_timeout_s,
@@ -196,606 +307,593 @@ class SmokeRunner:
         return out
 
     def ensure_workspace(self) -> None:
-        if self.state.get("workspace_registered"):
-            return
-        status, body = self.client.post(
-            "/workspace/register",
-            {
-                "workspace_id": self.args.workspace_id,
-                "root_path": self.args.root_path,
-                "manifest_path": self.args.manifest_path,
-            },
-        )
-        self._expect("workspace_register", status, 200, body)
-        self.state["workspace_registered"] = True
+        with self._state_lock:
+            if self.state.get("workspace_registered"):
+                return
+            status, body = self.client.post(
+                "/workspace/register",
+                {
+                    "workspace_id": self.args.workspace_id,
+                    "root_path": self.args.root_path,
+                    "manifest_path": self.args.manifest_path,
+                },
+                parse_body=False,
+            )
+            self._expect("workspace_register", status, 200, body)
+            self.state["workspace_registered"] = True
 
     def ensure_overlay_context(self) -> str:
-        existing = self.state.get("overlay_context_id")
-        if existing:
-            return str(existing)
-        self.ensure_workspace()
-        context_id = f"{self.args.workspace_id}:pr:smoke"
-        status, body = self.client.post(
-            "/context/create-pr-overlay",
-            {
-                "workspace_id": self.args.workspace_id,
-                "pr_id": "smoke",
-                "base_ref": "main",
-                "head_ref": "smoke",
-                "context_id": context_id,
-            },
-        )
-        self._expect("context_create_overlay", status, 200, body)
-        self.state["overlay_context_id"] = context_id
-        return context_id
+        with self._state_lock:
+            existing = self.state.get("overlay_context_id")
+            if existing:
+                return str(existing)
+            self.ensure_workspace()
+            context_id = f"{self.args.workspace_id}:pr:smoke"
+            status, body = self.client.post(
+                "/context/create-pr-overlay",
+                {
+                    "workspace_id": self.args.workspace_id,
+                    "pr_id": "smoke",
+                    "base_ref": "main",
+                    "head_ref": "smoke",
+                    "context_id": context_id,
+                },
+                parse_body=False,
+            )
+            self._expect("context_create_overlay", status, 200, body)
+            self.state["overlay_context_id"] = context_id
+            return context_id
+
+    def ensure_candidates(self) -> list[str]:
+        # classify-freshness and fetch-references recall the same candidate set.
+        with self._state_lock:
+            cached = self.state.get("explore_candidates")
+            if cached is not None:
+                return cached
+            self.ensure_workspace()
+            status, body = self.client.post("/explore/list-candidates", self._query_body)
+            self._expect("explore_list_candidates", status, 200, body)
+            candidates = list(body.get("candidates", []))
+            self.state["explore_candidates"] = candidates
+            return candidates
 
     def ensure_sync_job(self) -> str | None:
-        existing = self.state.get("sync_job_id")
-        if existing:
-            return str(existing)
-        if not self.args.repo_id or not self.args.commit_sha:
-            return None
-        self.ensure_workspace()
-        status, body = self.client.post(
-            f"{self._workspace_path()}/sync-repo",
-            {
-                "repo_id": self.args.repo_id,
-                "commit_sha": self.args.commit_sha,
-                "branch": self.args.branch,
-                "force_clean": self.args.force_clean,
-            },
-        )
-        self._expect("sync_repo", status, 200, body)
-        job_id = str(body.get("job_id", ""))
-        if not job_id:
-            raise RuntimeError(f"sync-repo returned no job_id: body={body}")
-        self.state["sync_job_id"] = job_id
-        return job_id
+        with self._state_lock:
+            existing = self.state.get("sync_job_id")
+            if existing:
+                return str(existing)
+            if not self.args.repo_id or not self.args.commit_sha:
+                return None
+            self.ensure_workspace()
+            status, body = self.client.post(
+                f"{self._workspace_path()}/sync-repo",
+                {
+                    "repo_id": self.args.repo_id,
+                    "commit_sha": self.args.commit_sha,
+                    "branch": self.args.branch,
+                    "force_clean": self.args.force_clean,
+                },
+            )
+            self._expect("sync_repo", status, 200, body)
+            job_id = str(body.get("job_id", ""))
+            if not job_id:
+                raise RuntimeError(f"sync-repo returned no job_id: body={body}")
+            self.state["sync_job_id"] = job_id
+            return job_id
 
     def ensure_vector_record(self) -> tuple[str, str] | None:
-        repo_id = self.args.repo_id or "repoA"
-        commit_sha = self.args.commit_sha or ("a" * 40)
-        key = f"{repo_id}:{commit_sha}:{self.args.embedding_model}"
-        if self.state.get("vector_record_key") == key:
-            return repo_id, commit_sha
-
-        self.ensure_workspace()
-        embedding = [0.0] * self.args.embedding_dim
-        payload = {
-            "workspace_id": self.args.workspace_id,
-            "repo_id": repo_id,
-            "commit_sha": commit_sha,
-            "branch": self.args.branch or "main",
-            "summary_text": "smoke summary text",
-            "embedding_model": self.args.embedding_model,
-            "embedding": embedding,
-            "metadata": {"source": "api_smoke_test"},
-        }
-        status, body = self.client.post("/commit-diff-summaries/upsert", payload)
-        if status == 503:
-            return None
-        self._expect("vector_upsert", status, 200, body)
-        self.state["vector_record_key"] = key
-        return repo_id, commit_sha
-
-    def test_health(self) -> TestResult:
-        name = "health"
-        try:
-            status, body = self.client.get("/health")
-            self._expect(name, status, 200, body)
-            self._dump_response(name, body)
-            return self._ok(name, f"status={body.get('status')} version={body.get('version')}")
-        except Exception as exc:
-            return self._fail(name, str(exc))
-
-    def test_rg_basic(self) -> TestResult:
-        name = "rg_basic"
-        try:
-            status, health = self.client.get("/health")
-            self._expect(name, status, 200, health)
-            if not bool(health.get("rg_available", False)):
-                return self._fail(name, "health.rg_available=false")
+        with self._state_lock:
+            repo_id, commit_sha = self._vector_record
+            key = f"{repo_id}:{commit_sha}:{self.args.embedding_model}"
+            if self.state.get("vector_record_key") == key:
+                return repo_id, commit_sha
+            # A 503 means the deployment has vectors disabled; later vector
+            # tests skip without repeating the upsert.
+            if self.state.get("vector_enabled") is False:
+                return None
 
             self.ensure_workspace()
-            status, body = self.client.post("/query/references", self._query_payload_base(self.args.symbol))
-            self._expect(name, status, 200, body)
-            self._dump_response(name, body)
-            warnings = (
-                body.get("confidence", {}).get("warnings", [])
-                if isinstance(body, dict)
-                else []
-            )
-            recall_warnings = [w for w in warnings if str(w).startswith("recall[")]
-            if recall_warnings:
-                return self._fail(name, f"recall warnings present: {recall_warnings}")
-            return self._ok(name, "rg available and no recall errors")
-        except Exception as exc:
-            return self._fail(name, str(exc))
+            payload = {
+                "workspace_id": self.args.workspace_id,
+                "repo_id": repo_id,
+                "commit_sha": commit_sha,
+                "branch": self.args.branch or "main",
+                "summary_text": "smoke summary text",
+                "embedding_model": self.args.embedding_model,
+                "embedding": self._zero_embedding(),
+                "metadata": {"source": "api_smoke_test"},
+            }
+            status, body = self.client.post("/commit-diff-summaries/upsert", payload, parse_body=False)
+            if status == 503:
+                self.state["vector_enabled"] = False
+                return None
+            self._expect("vector_upsert", status, 200, body)
+            self.state["vector_enabled"] = True
+            self.state["vector_record_key"] = key
+            return repo_id, commit_sha
 
-    def test_workspace_register(self) -> TestResult:
-        name = "workspace_register"
-        try:
-            self.ensure_workspace()
-            return self._ok(name, "workspace registered")
-        except Exception as exc:
-            return self._fail(name, str(exc))
+    def _wait_for_jobs(
+        self,
+        name: str,
+        job_ids: list[str],
+        poll_start: float = 0.05,
+        poll_max: float = 1.0,
+    ) -> dict[str, Any]:
+        """Poll sync jobs with per-job exponential backoff until terminal or timed out.
+
+        Polling failures are reported under the calling test's ``name``.
+        With ``--wait-sync-jobs-s 0`` every job is fetched exactly once.
+        """
+        deadline = time.monotonic() + self.args.wait_sync_jobs_s
+        latest: dict[str, Any] = {}
+        next_poll = {job_id: 0.0 for job_id in job_ids}
+        interval = {job_id: poll_start for job_id in job_ids}
+        paths = {job_id: f"/sync-jobs/{urllib.parse.quote(job_id)}" for job_id in job_ids}
+        while next_poll:
+            now = time.monotonic()
+            expired = now >= deadline
+            for job_id in [j for j, due in next_poll.items() if expired or due <= now]:
+                status, body = self.client.get(paths[job_id])
+                self._expect(name, status, 200, body)
+                latest[job_id] = body
+                if expired or body.get("status") in _TERMINAL_JOB_STATUSES:
+                    del next_poll[job_id]
+                    continue
+                next_poll[job_id] = now + interval[job_id]
+                interval[job_id] = min(interval[job_id] * 2, poll_max)
+            if next_poll:
+                wake_at = min(min(next_poll.values()), deadline)
+                time.sleep(max(0.0, wake_at - time.monotonic()))
+        return latest
+
+    @_smoke_test
+    def test_health(self, name: str) -> TestResult:
+        status, body = self._get_health()
+        self._expect(name, status, 200, body)
+        self._dump_response(name, body)
+        return self._ok(name, f"status={body.get('status')} version={body.get('version')}")
+
+    @_smoke_test
+    def test_rg_basic(self, name: str) -> TestResult:
+        status, health = self._get_health()
+        self._expect(name, status, 200, health)
+        if not bool(health.get("rg_available", False)):
+            return self._fail(name, "health.rg_available=false")
 
-    def test_workspace_get(self) -> TestResult:
-        name = "workspace_get"
-        try:
-            self.ensure_workspace()
-            status, body = self.client.get(self._workspace_path())
-            self._expect(name, status, 200, body)
-            self._dump_response(name, body)
-            return self._ok(name)
-        except Exception as exc:
-            return self._fail(name, str(exc))
+        self.ensure_workspace()
+        status, body = self.client.post("/query/references", self._query_body)
+        self._expect(name, status, 200, body)
+        self._dump_response(name, body)
+        warnings = (
+            body.get("confidence", {}).get("warnings", [])
+            if isinstance(body, dict)
+            else []
+        )
+        recall_warnings = [w for w in warnings if str(w).startswith("recall[")]
+        if recall_warnings:
+            return self._fail(name, f"recall warnings present: {recall_warnings}")
+        return self._ok(name, "rg available and no recall errors")
 
-    def test_workspace_refresh(self) -> TestResult:
-        name = "workspace_refresh"
-        try:
-            self.ensure_workspace()
-            status, body = self.client.post(f"{self._workspace_path()}/refresh-manifest", {})
-            self._expect(name, status, 200, body)
-            self._dump_response(name, body)
-            return self._ok(name)
-        except Exception as exc:
-            return self._fail(name, str(exc))
+    @_smoke_test
+    def test_workspace_register(self, name: str) -> TestResult:
+        self.ensure_workspace()
+        return self._ok(name, "workspace registered")
 
-    def test_context_create_overlay(self) -> TestResult:
-        name = "context_create_overlay"
-        try:
-            cid = self.ensure_overlay_context()
-            if self.args.print_response:
-                self._dump_response(name, {"context_id": cid})
-            return self._ok(name, f"context_id={cid}")
-        except Exception as exc:
-            return self._fail(name, str(exc))
+    @_smoke_test
+    def test_workspace_get(self, name: str) -> TestResult:
+        self.ensure_workspace()
+        status, body = self.client.get(self._workspace_path(), parse_body=self._dump_bodies)
+        self._expect(name, status, 200, body)
+        self._dump_response(name, body)
+        return self._ok(name)
 
-    def test_context_expire(self) -> TestResult:
-        name = "context_expire"
-        try:
-            cid = self.ensure_overlay_context()
-            status, body = self.client.post(f"/context/{urllib.parse.quote(cid)}/expire", {})
-            self._expect(name, status, 200, body)
-            self._dump_response(name, body)
-            return self._ok(name, f"context_id={cid}")
-        except Exception as exc:
-            return self._fail(name, str(exc))
+    @_smoke_test
+    def test_workspace_refresh(self, name: str) -> TestResult:
+        self.ensure_workspace()
+        status, body = self.client.post(
+            f"{self._workspace_path()}/refresh-manifest", {}, parse_body=self._dump_bodies
+        )
+        self._expect(name, status, 200, body)
+        self._dump_response(name, body)
+        return self._ok(name)
+
+    @_smoke_test
+    def test_context_create_overlay(self, name: str) -> TestResult:
+        cid = self.ensure_overlay_context()
+        if self.args.print_response:
+            self._dump_response(name, {"context_id": cid})
+        return self._ok(name, f"context_id={cid}")
+
+    @_smoke_test
+    def test_context_expire(self, name: str) -> TestResult:
+        cid = self.ensure_overlay_context()
+        status, body = self.client.post(
+            f"/context/{urllib.parse.quote(cid)}/expire", {}, parse_body=self._dump_bodies
+        )
+        self._expect(name, status, 200, body)
+        self._dump_response(name, body)
+        return self._ok(name, f"context_id={cid}")
 
-    def test_query_references(self) -> TestResult:
-        name = "query_references"
-        try:
-            self.ensure_workspace()
-            status, body = self.client.post("/query/references", self._query_payload_base(self.args.symbol))
-            self._expect(name, status, 200, body)
-            self._dump_response(name, body)
-            return self._ok(name)
-        except Exception as exc:
-            return self._fail(name, str(exc))
+    @_smoke_test
+    def test_query_references(self, name: str) -> TestResult:
+        self.ensure_workspace()
+        status, body = self.client.post("/query/references", self._query_body, parse_body=self._dump_bodies)
+        self._expect(name, status, 200, body)
+        self._dump_response(name, body)
+        return self._ok(name)
 
-    def test_query_definition(self) -> TestResult:
-        name = "query_definition"
-        try:
-            self.ensure_workspace()
-            status, body = self.client.post("/query/definition", self._query_payload_base(self.args.symbol))
-            self._expect(name, status, 200, body)
-            self._dump_response(name, body)
-            return self._ok(name)
-        except Exception as exc:
-            return self._fail(name, str(exc))
+    @_smoke_test
+    def test_query_definition(self, name: str) -> TestResult:
+        self.ensure_workspace()
+        status, body = self.client.post("/query/definition", self._query_body, parse_body=self._dump_bodies)
+        self._expect(name, status, 200, body)
+        self._dump_response(name, body)
+        return self._ok(name)
 
-    def test_query_call_graph(self) -> TestResult:
-        name = "query_call_graph"
-        try:
-            self.ensure_workspace()
-            payload = self._query_payload_base(self.args.symbol)
-            payload["direction"] = "both"
-            status, body = self.client.post("/query/call-graph", payload)
-            self._expect(name, status, 200, body)
-            self._dump_response(name, body)
-            return self._ok(name)
-        except Exception as exc:
-            return self._fail(name, str(exc))
+    @_smoke_test
+    def test_query_call_graph(self, name: str) -> TestResult:
+        self.ensure_workspace()
+        payload = {**self._query_base, "direction": "both"}
+        status, body = self.client.post("/query/call-graph", payload, parse_body=self._dump_bodies)
+        self._expect(name, status, 200, body)
+        self._dump_response(name, body)
+        return self._ok(name)
+
+    @_smoke_test
+    def test_query_file_symbols(self, name: str) -> TestResult:
+        self.ensure_workspace()
+        status, body = self.client.post(
+            "/query/file-symbols",
+            {"workspace_id": self.args.workspace_id, "file_key": self.args.file_key},
+            parse_body=self._dump_bodies,
+        )
+        self._expect(name, status, 200, body)
+        self._dump_response(name, body)
+        return self._ok(name)
 
-    def test_query_file_symbols(self) -> TestResult:
-        name = "query_file_symbols"
-        try:
-            self.ensure_workspace()
-            status, body = self.client.post(
-                "/query/file-symbols",
-                {"workspace_id": self.args.workspace_id, "file_key": self.args.file_key},
-            )
-            self._expect(name, status, 200, body)
-            self._dump_response(name, body)
-            return self._ok(name)
-        except Exception as exc:
-            return self._fail(name, str(exc))
+    @_smoke_test
+    def test_explore_rg_search(self, name: str) -> TestResult:
+        self.ensure_workspace()
+        rg_query = self._require_rg_query(name)
+        if not rg_query:
+            return self._skip(name, "requires --rg-query for symbol-free text search")
+        _status, body = self._run_explore_rg_search(name)
+        self._dump_response(name, body)
+        return self._ok(name, f"hits={len(body.get('hits', []))}")
 
-    def test_explore_rg_search(self) -> TestResult:
-        name = "explore_rg_search"
-        try:
-            self.ensure_workspace()
-            rg_query = self._require_rg_query(name)
-            if not rg_query:
-                return self._skip(name, "requires --rg-query for symbol-free text search")
-            _status, body = self._run_explore_rg_search(name)
-            self._dump_response(name, body)
-            return self._ok(name, f"hits={len(body.get('hits', []))}")
-        except Exception as exc:
-            return self._fail(name, str(exc))
+    @_smoke_test
+    def test_explore_fetch_call_edges(self, name: str) -> TestResult:
+        self.ensure_workspace()
+        if not (self.args.symbol or "").strip():
+            return self._skip(name, "requires --symbol")
+        rg_query = self._require_rg_query(name)
+        if not rg_query:
+            return self._skip(name, "requires --rg-query to build candidate file set")
 
-    def test_explore_fetch_call_edges(self) -> TestResult:
-        name = "explore_fetch_call_edges"
-        try:
-            self.ensure_workspace()
-            if not (self.args.symbol or "").strip():
-                return self._skip(name, "requires --symbol")
-            rg_query = self._require_rg_query(name)
-            if not rg_query:
-                return self._skip(name, "requires --rg-query to build candidate file set")
-
-            _status, rg_body = self._run_explore_rg_search(name)
-            candidate_keys = self._candidate_file_keys_from_rg(rg_body)
-            if not candidate_keys:
-                return self._skip(name, "rg search returned no candidate files")
-
-            status, parse_body = self.client.post(
-                "/explore/parse-file",
-                {
-                    "workspace_id": self.args.workspace_id,
-                    "file_keys": candidate_keys[: self.args.agent_max_candidate_files],
-                    "max_parse_workers": self.args.max_parse_workers or self.args.agent_parse_workers,
-                    "timeout_s": self.args.agent_parse_timeout_s,
-                    "skip_if_fresh": True,
-                },
-            )
-            self._expect(name, status, 200, parse_body)
+        _status, rg_body = self._run_explore_rg_search(name)
+        candidate_keys = self._candidate_file_keys_from_rg(rg_body)
+        if not candidate_keys:
+            return self._skip(name, "rg search returned no candidate files")
 
-            status, body = self.client.post(
-                "/explore/fetch-call-edges",
-                {
-                    "workspace_id": self.args.workspace_id,
-                    "symbol": self.args.symbol,
-                    "direction": self.args.call_direction,
-                    "candidate_file_keys": candidate_keys[: self.args.agent_max_candidate_files],
-                    "excluded_file_keys": [],
-                    "limit": self.args.call_limit,
-                },
-            )
-            self._expect(name, status, 200, body)
-            self._dump_response(name, body)
-            return self._ok(
-                name,
-                f"candidates={len(candidate_keys)} edges={len(body.get('edges', []))}",
-            )
-        except Exception as exc:
-            return self._fail(name, str(exc))
+        status, parse_body = self.client.post(
+            "/explore/parse-file",
+            {
+                "workspace_id": self.args.workspace_id,
+                "file_keys": candidate_keys[: self.args.agent_max_candidate_files],
+                "max_parse_workers": self.args.max_parse_workers or self.args.agent_parse_workers,
+                "timeout_s": self.args.agent_parse_timeout_s,
+                "skip_if_fresh": True,
+            },
+            parse_body=False,
+        )
+        self._expect(name, status, 200, parse_body)
 
-    def test_explore_list_candidates(self) -> TestResult:
-        name = "explore_list_candidates"
-        try:
-            self.ensure_workspace()
-            payload = self._query_payload_base(self.args.symbol)
-            payload["max_files"] = self.args.max_recall_files or 50
-            status, body = self.client.post("/explore/list-candidates", payload)
-            self._expect(name, status, 200, body)
-            self._dump_response(name, body)
-            return self._ok(name)
-        except Exception as exc:
-            return self._fail(name, str(exc))
+        status, body = self.client.post(
+            "/explore/fetch-call-edges",
+            {
+                "workspace_id": self.args.workspace_id,
+                "symbol": self.args.symbol,
+                "direction": self.args.call_direction,
+                "candidate_file_keys": candidate_keys[: self.args.agent_max_candidate_files],
+                "excluded_file_keys": [],
+                "limit": self.args.call_limit,
+            },
+        )
+        self._expect(name, status, 200, body)
+        self._dump_response(name, body)
+        return self._ok(
+            name,
+            f"candidates={len(candidate_keys)} edges={len(body.get('edges', []))}",
+        )
 
-    def test_explore_classify_freshness(self) -> TestResult:
-        name = "explore_classify_freshness"
-        try:
-            self.ensure_workspace()
-            status, listed = self.client.post("/explore/list-candidates", self._query_payload_base(self.args.symbol))
-            self._expect(name, status, 200, listed)
-            candidate_keys = listed.get("candidates", [])[:20]
-            status, body = self.client.post(
-                "/explore/classify-freshness",
-                {
-                    "workspace_id": self.args.workspace_id,
-                    "candidate_file_keys": candidate_keys,
-                },
-            )
-            self._expect(name, status, 200, body)
-            self._dump_response(name, body)
-            return self._ok(name)
-        except Exception as exc:
-            return self._fail(name, str(exc))
+    @_smoke_test
+    def test_explore_list_candidates(self, name: str) -> TestResult:
+        self.ensure_workspace()
+        payload = {**self._query_base, "max_files": self.args.max_recall_files or 50}
+        status, body = self.client.post("/explore/list-candidates", payload, parse_body=self._dump_bodies)
+        self._expect(name, status, 200, body)
+        self._dump_response(name, body)
+        return self._ok(name)
+
+    @_smoke_test
+    def test_explore_classify_freshness(self, name: str) -> TestResult:
+        candidate_keys = self.ensure_candidates()[:20]
+        status, body = self.client.post(
+            "/explore/classify-freshness",
+            {
+                "workspace_id": self.args.workspace_id,
+                "candidate_file_keys": candidate_keys,
+            },
+            parse_body=self._dump_bodies,
+        )
+        self._expect(name, status, 200, body)
+        self._dump_response(name, body)
+        return self._ok(name)
 
-    def test_explore_fetch_references(self) -> TestResult:
-        name = "explore_fetch_references"
-        try:
-            self.ensure_workspace()
-            status, listed = self.client.post("/explore/list-candidates", self._query_payload_base(self.args.symbol))
-            self._expect(name, status, 200, listed)
-            status, body = self.client.post(
-                "/explore/fetch-references",
-                {
-                    "workspace_id": self.args.workspace_id,
-                    "symbol": self.args.symbol,
-                    "candidate_file_keys": listed.get("candidates", [])[:50],
-                },
-            )
-            self._expect(name, status, 200, body)
-            self._dump_response(name, body)
-            return self._ok(name)
-        except Exception as exc:
-            return self._fail(name, str(exc))
+    @_smoke_test
+    def test_explore_fetch_references(self, name: str) -> TestResult:
+        candidate_keys = self.ensure_candidates()[:50]
+        status, body = self.client.post(
+            "/explore/fetch-references",
+            {
+                "workspace_id": self.args.workspace_id,
+                "symbol": self.args.symbol,
+                "candidate_file_keys": candidate_keys,
+            },
+            parse_body=self._dump_bodies,
+        )
+        self._expect(name, status, 200, body)
+        self._dump_response(name, body)
+        return self._ok(name)
 
-    def test_explore_get_confidence(self) -> TestResult:
-        name = "explore_get_confidence"
-        try:
-            status, body = self.client.post(
-                "/explore/get-confidence",
-                {"verified_files": [self.args.file_key]},
-            )
-            self._expect(name, status, 200, body)
-            self._dump_response(name, body)
-            return self._ok(name)
-        except Exception as exc:
-            return self._fail(name, str(exc))
+    @_smoke_test
+    def test_explore_get_confidence(self, name: str) -> TestResult:
+        status, body = self.client.post(
+            "/explore/get-confidence",
+            {"verified_files": [self.args.file_key]},
+            parse_body=self._dump_bodies,
+        )
+        self._expect(name, status, 200, body)
+        self._dump_response(name, body)
+        return self._ok(name)
 
-    def test_agent_call_graph_flow(self) -> TestResult:
-        name = "agent_call_graph_flow"
-        try:
-            self.ensure_workspace()
-            if not (self.args.symbol or "").strip():
-                return self._skip(name, "requires --symbol")
-            rg_query = self._require_rg_query(name)
-            if not rg_query:
-                return self._skip(name, "requires --rg-query")
+    @_smoke_test
+    def test_agent_call_graph_flow(self, name: str) -> TestResult:
+        self.ensure_workspace()
+        if not (self.args.symbol or "").strip():
+            return self._skip(name, "requires --symbol")
+        rg_query = self._require_rg_query(name)
+        if not rg_query:
+            return self._skip(name, "requires --rg-query")
 
-            _status, rg_body = self._run_explore_rg_search(name)
-            candidate_keys = self._candidate_file_keys_from_rg(rg_body)
-            if not candidate_keys:
-                return self._skip(name, "rg search returned no candidate files")
+        _status, rg_body = self._run_explore_rg_search(name)
+        candidate_keys = self._candidate_file_keys_from_rg(rg_body)
+        if not candidate_keys:
+            return self._skip(name, "rg search returned no candidate files")
 
-            limited_candidates = candidate_keys[: self.args.agent_max_candidate_files]
+        limited_candidates = candidate_keys[: self.args.agent_max_candidate_files]
 
-            status, parse_body = self.client.post(
-                "/explore/parse-file",
-                {
-                    "workspace_id": self.args.workspace_id,
-                    "file_keys": limited_candidates,
-                    "max_parse_workers": self.args.max_parse_workers or self.args.agent_parse_workers,
-                    "timeout_s": self.args.agent_parse_timeout_s,
-                    "skip_if_fresh": True,
-                },
-            )
-            self._expect(name, status, 200, parse_body)
+        status, parse_body = self.client.post(
+            "/explore/parse-file",
+            {
+                "workspace_id": self.args.workspace_id,
+                "file_keys": limited_candidates,
+                "max_parse_workers": self.args.max_parse_workers or self.args.agent_parse_workers,
+                "timeout_s": self.args.agent_parse_timeout_s,
+                "skip_if_fresh": True,
+            },
+        )
+        self._expect(name, status, 200, parse_body)
 
-            status, edge_body = self.client.post(
-                "/explore/fetch-call-edges",
-                {
-                    "workspace_id": self.args.workspace_id,
-                    "symbol": self.args.symbol,
-                    "direction": self.args.call_direction,
-                    "candidate_file_keys": limited_candidates,
-                    "excluded_file_keys": [],
-                    "limit": self.args.call_limit,
-                },
-            )
-            self._expect(name, status, 200, edge_body)
+        status, edge_body = self.client.post(
+            "/explore/fetch-call-edges",
+            {
+                "workspace_id": self.args.workspace_id,
+                "symbol": self.args.symbol,
+                "direction": self.args.call_direction,
+                "candidate_file_keys": limited_candidates,
+                "excluded_file_keys": [],
+                "limit": self.args.call_limit,
+            },
+        )
+        self._expect(name, status, 200, edge_body)
 
-            confidence_verified = list(parse_body.get("parsed_file_keys", [])) + list(parse_body.get("skipped_fresh_file_keys", []))
-            confidence_unparsed = list(parse_body.get("unparsed_file_keys", []))
-            confidence_failed = list(parse_body.get("failed_file_keys", []))
-            status, conf_body = self.client.post(
-                "/explore/get-confidence",
-                {
-                    "verified_files": confidence_verified,
-                    "stale_files": confidence_failed,
-                    "unparsed_files": confidence_unparsed,
-                    "warnings": parse_body.get("parse_warnings", []),
-                    "overlay_mode": parse_body.get("overlay_mode", "sparse"),
-                },
-            )
-            self._expect(name, status, 200, conf_body)
+        confidence_verified = list(parse_body.get("parsed_file_keys", [])) + list(parse_body.get("skipped_fresh_file_keys", []))
+        confidence_unparsed = list(parse_body.get("unparsed_file_keys", []))
+        confidence_failed = list(parse_body.get("failed_file_keys", []))
+        status, conf_body = self.client.post(
+            "/explore/get-confidence",
+            {
+                "verified_files": confidence_verified,
+                "stale_files": confidence_failed,
+                "unparsed_files": confidence_unparsed,
+                "warnings": parse_body.get("parse_warnings", []),
+                "overlay_mode": parse_body.get("overlay_mode", "sparse"),
+            },
+        )
+        self._expect(name, status, 200, conf_body)
 
-            status, wrapper_body = self.client.post(
-                "/query/call-graph",
-                {
-                    **self._query_payload_base(self.args.symbol),
-                    "direction": self.args.call_direction,
-                },
-            )
-            self._expect(name, status, 200, wrapper_body)
-
-            combined = {
-                "rg_search": rg_body,
-                "parse_file": parse_body,
-                "fetch_call_edges": edge_body,
-                "explore_confidence": conf_body,
-                "query_call_graph": wrapper_body,
-            }
-            self._dump_response(name, combined)
-            return self._ok(
-                name,
-                " -> ".join(
-                    [
-                        f"rg_hits={len(rg_body.get('hits', []))}",
-                        f"candidate_files={len(limited_candidates)}",
-                        f"parsed={len(parse_body.get('parsed_file_keys', []))}",
-                        f"edge_rows={len(edge_body.get('edges', []))}",
-                        f"wrapper_edges={len(wrapper_body.get('edges', []))}",
-                    ]
-                ),
-            )
-        except Exception as exc:
-            return self._fail(name, str(exc))
+        status, wrapper_body = self.client.post(
+            "/query/call-graph",
+            {
+                **self._query_base,
+                "direction": self.args.call_direction,
+            },
+        )
+        self._expect(name, status, 200, wrapper_body)
+
+        combined = {
+            "rg_search": rg_body,
+            "parse_file": parse_body,
+            "fetch_call_edges": edge_body,
+            "explore_confidence": conf_body,
+            "query_call_graph": wrapper_body,
+        }
+        self._dump_response(name, combined)
+        return self._ok(
+            name,
+            " -> ".join(
+                [
+                    f"rg_hits={len(rg_body.get('hits', []))}",
+                    f"candidate_files={len(limited_candidates)}",
+                    f"parsed={len(parse_body.get('parsed_file_keys', []))}",
+                    f"edge_rows={len(edge_body.get('edges', []))}",
+                    f"wrapper_edges={len(wrapper_body.get('edges', []))}",
+                ]
+            ),
+        )
 
-    def test_cache_invalidate(self) -> TestResult:
-        name = "cache_invalidate"
-        try:
-            self.ensure_workspace()
-            status, body = self.client.post(
-                "/cache/invalidate",
-                {"workspace_id": self.args.workspace_id, "context_id": "", "file_keys": [self.args.file_key]},
-            )
-            self._expect(name, status, 200, body)
-            self._dump_response(name, body)
-            return self._ok(name)
-        except Exception as exc:
-            return self._fail(name, str(exc))
+    @_smoke_test
+    def test_cache_invalidate(self, name: str) -> TestResult:
+        self.ensure_workspace()
+        status, body = self.client.post(
+            "/cache/invalidate",
+            {"workspace_id": self.args.workspace_id, "context_id": "", "file_keys": [self.args.file_key]},
+            parse_body=self._dump_bodies,
+        )
+        self._expect(name, status, 200, body)
+        self._dump_response(name, body)
+        return self._ok(name)
 
-    def test_webhook_gitlab(self) -> TestResult:
-        name = "webhook_gitlab"
-        try:
-            self.ensure_workspace()
-            status, body = self.client.post(
-                "/webhooks/gitlab",
-                {
-                    "event_type": "merge_request",
-                    "payload": {
-                        "workspace_id": self.args.workspace_id,
-                        "repo_id": self.args.repo_id,
-                        "event_sha": self.args.commit_sha,
-                        "branch": self.args.branch,
-                    },
+    @_smoke_test
+    def test_webhook_gitlab(self, name: str) -> TestResult:
+        self.ensure_workspace()
+        status, body = self.client.post(
+            "/webhooks/gitlab",
+            {
+                "event_type": "merge_request",
+                "payload": {
+                    "workspace_id": self.args.workspace_id,
+                    "repo_id": self.args.repo_id,
+                    "event_sha": self.args.commit_sha,
+                    "branch": self.args.branch,
                 },
-            )
-            self._expect(name, status, 200, body)
-            self._dump_response(name, body)
-            return self._ok(name, f"index_job_id={body.get('index_job_id', '')}")
-        except Exception as exc:
-            return self._fail(name, str(exc))
+            },
+        )
+        self._expect(name, status, 200, body)
+        self._dump_response(name, body)
+        return self._ok(name, f"index_job_id={body.get('index_job_id', '')}")
 
-    def test_sync_repo(self) -> TestResult:
-        name = "sync_repo"
+    @_smoke_test
+    def test_sync_repo(self, name: str) -> TestResult:
         if not self.args.repo_id or not self.args.commit_sha:
             return self._skip(name, "requires --repo-id and --commit-sha")
-        try:
-            job_id = self.ensure_sync_job()
-            return self._ok(name, f"job_id={job_id}")
-        except Exception as exc:
-            return self._fail(name, str(exc))
+        job_id = self.ensure_sync_job()
+        return self._ok(name, f"job_id={job_id}")
 
-    def test_sync_job_get(self) -> TestResult:
-        name = "sync_job_get"
+    @_smoke_test
+    def test_sync_job_get(self, name: str) -> TestResult:
         if not self.args.repo_id or not self.args.commit_sha:
             return self._skip(name, "requires --repo-id and --commit-sha")
-        try:
-            job_id = self.ensure_sync_job()
-            assert job_id is not None
-            status, body = self.client.get(f"/sync-jobs/{urllib.parse.quote(job_id)}")
-            self._expect(name, status, 200, body)
-            self._dump_response(name, body)
-            return self._ok(name)
-        except Exception as exc:
-            return self._fail(name, str(exc))
-
-    def test_sync_batch(self) -> TestResult:
-        name = "sync_batch"
+        job_id = self.ensure_sync_job()
+        assert job_id is not None
+        body = self._wait_for_jobs(name, [job_id])[job_id]
+        self._dump_response(name, body)
+        return self._ok(name, f"status={body.get('status', '')}")
+
+    @_smoke_test
+    def test_sync_batch(self, name: str) -> TestResult:
         if not self.args.repo_id or not self.args.commit_sha:
             return self._skip(name, "requires --repo-id and --commit-sha")
-        try:
-            self.ensure_workspace()
-            status, body = self.client.post(
-                f"{self._workspace_path()}/sync-batch",
-                {"targets": [{"repo_id": self.args.repo_id, "commit_sha": self.args.commit_sha}]},
-            )
-            self._expect(name, status, 200, body)
-            self._dump_response(name, body)
-            return self._ok(name)
-        except Exception as exc:
-            return self._fail(name, str(exc))
-
-    def test_sync_status(self) -> TestResult:
-        name = "sync_status"
+        self.ensure_workspace()
+        status, body = self.client.post(
+            f"{self._workspace_path()}/sync-batch",
+            {"targets": [{"repo_id": self.args.repo_id, "commit_sha": self.args.commit_sha}]},
+        )
+        self._expect(name, status, 200, body)
+        job_ids = [str(job.get("job_id", "")) for job in body.get("jobs", []) if job.get("job_id")]
+        if self.args.wait_sync_jobs_s > 0 and job_ids:
+            body = {"jobs": list(self._wait_for_jobs(name, job_ids).values())}
+        self._dump_response(name, body)
+        statuses = ",".join(str(job.get("status", "")) for job in body.get("jobs", []))
+        return self._ok(name, f"jobs={len(job_ids)} status={statuses}")
+
+    @_smoke_test
+    def test_sync_status(self, name: str) -> TestResult:
         if not self.args.repo_id:
             return self._skip(name, "requires --repo-id")
-        try:
-            self.ensure_workspace()
-            status, body = self.client.get(
-                f"{self._workspace_path()}/repos/{urllib.parse.quote(self.args.repo_id)}/sync-status"
-            )
-            self._expect(name, status, 200, body)
-            self._dump_response(name, body)
-            return self._ok(name)
-        except Exception as exc:
-            return self._fail(name, str(exc))
-
-    def test_sync_all_repos(self) -> TestResult:
-        name = "sync_all_repos"
-        try:
-            self.ensure_workspace()
-            status, body = self.client.post(
-                f"{self._workspace_path()}/sync-all-repos",
-                {"force_clean": self.args.force_clean},
-            )
-            self._expect(name, status, 200, body)
-            self._dump_response(name, body)
-            jobs = body.get("jobs", [])
-            return self._ok(name, f"jobs={len(jobs)} skipped={len(body.get('skipped_repos', []))}")
-        except Exception as exc:
-            return self._fail(name, str(exc))
-
-    def test_vector_upsert(self) -> TestResult:
-        name = "vector_upsert"
-        try:
-            rec = self.ensure_vector_record()
-            if rec is None:
-                return self._skip(name, "vector feature unavailable (503)")
-            return self._ok(name)
-        except Exception as exc:
-            return self._fail(name, str(exc))
-
-    def test_vector_search(self) -> TestResult:
-        name = "vector_search"
-        try:
-            rec = self.ensure_vector_record()
-            if rec is None:
-                return self._skip(name, "vector feature unavailable (503)")
-            status, body = self.client.post(
-                "/commit-diff-summaries/search",
-                {
-                    "workspace_id": self.args.workspace_id,
-                    "query_embedding": [0.0] * self.args.embedding_dim,
-                    "top_k": 5,
-                    "repo_ids": [self.args.repo_id] if self.args.repo_id else [],
-                    "branches": [self.args.branch] if self.args.branch else [],
-                    "score_threshold": 0.0,
-                },
-            )
-            self._expect(name, status, 200, body)
-            self._dump_response(name, body)
-            return self._ok(name)
-        except Exception as exc:
-            return self._fail(name, str(exc))
+        self.ensure_workspace()
+        status, body = self.client.get(
+            f"{self._workspace_path()}/repos/{self._repo_q}/sync-status",
+            parse_body=self._dump_bodies,
+        )
+        self._expect(name, status, 200, body)
+        self._dump_response(name, body)
+        return self._ok(name)
 
-    def test_vector_get(self) -> TestResult:
-        name = "vector_get"
-        try:
-            rec = self.ensure_vector_record()
-            if rec is None:
-                return self._skip(name, "vector feature unavailable (503)")
-            repo_id, commit_sha = rec
-            status, body = self.client.get(
-                f"/commit-diff-summaries/{urllib.parse.quote(self.args.workspace_id)}/"
-                f"{urllib.parse.quote(repo_id)}/{urllib.parse.quote(commit_sha)}"
-            )
-            self._expect(name, status, 200, body)
-            self._dump_response(name, body)
-            return self._ok(name)
-        except Exception as exc:
-            return self._fail(name, str(exc))
+    @_smoke_test
+    def test_sync_all_repos(self, name: str) -> TestResult:
+        self.ensure_workspace()
+        status, body = self.client.post(
+            f"{self._workspace_path()}/sync-all-repos",
+            {"force_clean": self.args.force_clean},
+        )
+        self._expect(name, status, 200, body)
+        self._dump_response(name, body)
+        jobs = body.get("jobs", [])
+        return self._ok(name, f"jobs={len(jobs)} skipped={len(body.get('skipped_repos', []))}")
+
+    @_smoke_test
+    def test_vector_upsert(self, name: str) -> TestResult:
+        rec = self.ensure_vector_record()
+        if rec is None:
+            return self._skip(name, "vector feature unavailable (503)")
+        return self._ok(name)
+
+    @_smoke_test
+    def test_vector_search(self, name: str) -> TestResult:
+        rec = self.ensure_vector_record()
+        if rec is None:
+            return self._skip(name, "vector feature unavailable (503)")
+        status, body = self.client.post(
+            "/commit-diff-summaries/search",
+            {
+                "workspace_id": self.args.workspace_id,
+                "query_embedding": self._zero_embedding(),
+                "top_k": 5,
+                "repo_ids": [self.args.repo_id] if self.args.repo_id else [],
+                "branches": [self.args.branch] if self.args.branch else [],
+                "score_threshold": 0.0,
+            },
+            parse_body=self._dump_bodies,
+        )
+        self._expect(name, status, 200, body)
+        self._dump_response(name, body)
+        return self._ok(name)
+
+    @_smoke_test
+    def test_vector_get(self, name: str) -> TestResult:
+        if self.ensure_vector_record() is None:
+            return self._skip(name, "vector feature unavailable (503)")
+        status, body = self.client.get(self._vector_record_path, parse_body=self._dump_bodies)
+        self._expect(name, status, 200, body)
+        self._dump_response(name, body)
+        return self._ok(name)
 
     def available_test_names(self) -> list[str]:
-        return [name for name, _ in self.tests]
-
-    def run_selected(self, selected: list[str]) -> list[TestResult]:
-        results: list[TestResult] = []
-        funcs = dict(self.tests)
-        for name in selected:
-            fn = funcs.get(name)
-            if fn is None:
-                results.append(TestResult(name, "fail", "unknown test name"))
-                continue
-            results.append(fn())
-        return results
+        return list(self._tests_by_name)
+
+    def run_selected(self, selected: list[str], concurrency: int = 1) -> list[TestResult]:
+        def run_one(name: str) -> TestResult:
+            return self._tests_by_name[name]()
+
+        if concurrency <= 1:
+            return [run_one(name) for name in selected]
+        # Probes are I/O bound and share one pooled client. A test is submitted once
+        # every selected dependency has finished; results keep selection order.
+        chosen = set(selected)
+        waiting = {name: _TEST_DEPENDS_ON.get(name, frozenset()) & chosen for name in dict.fromkeys(selected)}
+        finished: dict[str, TestResult] = {}
+        running: dict[Future[TestResult], str] = {}
+        with ThreadPoolExecutor(max_workers=concurrency) as pool:
+            while waiting or running:
+                for name in [n for n, deps in waiting.items() if deps <= finished.keys()]:
+                    del waiting[name]
+                    running[pool.submit(run_one, name)] = name
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    finished[running.pop(future)] = future.result()
+        return [finished[name] for name in selected]
 
 
 def parse_args(argv: list[str]) -> argparse.Namespace:
@@ -820,7 +918,19 @@ def parse_args(argv: list[str]) -> argparse.Namespace:
     parser.add_argument("--commit-sha", default="")
     parser.add_argument("--branch", default="")
     parser.add_argument("--force-clean", action="store_true", default=True)
+    parser.add_argument(
+        "--wait-sync-jobs-s",
+        type=float,
+        default=0.0,
+        help="Poll sync jobs with backoff for up to N seconds until they finish (0 = single fetch).",
+    )
     parser.add_argument("--timeout-s", type=float, default=60.0)
+    parser.add_argument(
+        "--http2",
+        action="store_true",
+        default=False,
+        help="Negotiate HTTP/2 (requires the http2 extra; plain http:// stays on HTTP/1.1).",
+    )
     parser.add_argument("--entry-repos", default="", help="Comma-separated entry repos for query scope.")
     parser.add_argument("--max-repo-hops", type=int, default=1)
     parser.add_argument("--max-recall-files", type=int, default=None)
@@ -833,6 +943,12 @@ def parse_args(argv: list[str]) -> argparse.Namespace:
         help="Comma-separated test names, or 'all'. Use --list-tests to inspect names.",
     )
     parser.add_argument("--print-response", action="store_true", default=False)
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        default=1,
+        help="Run up to N selected tests at once (shared setup still runs once).",
+    )
     parser.add_argument(
         "--allow-workspace-id-mismatch",
         action="store_true",
@@ -851,7 +967,8 @@ def main(argv: list[str]) -> int:
         return 1
 
     try:
-        raw = yaml.safe_load(manifest_path.read_text(encoding="utf-8"))
+        with manifest_path.open("rb") as fh:
+            raw = yaml.load(fh, Loader=_YamlLoader)
     except Exception as exc:
         print(f"[FAIL] failed to read manifest: {exc}")
         return 1
@@ -884,27 +1001,40 @@ def main(argv: list[str]) -> int:
             print(name)
         return 0
 
-    selected = runner.available_test_names() if args.tests.strip().lower() == "all" else [
-        s.strip() for s in args.tests.split(",") if s.strip()
-    ]
-
-    results = runner.run_selected(selected)
+    tests_arg = args.tests.strip().lower()
+    known = runner.available_test_names()
+    selected = known if tests_arg == "all" else [s.strip() for s in tests_arg.split(",") if s.strip()]
+    # Unknown names are reported up front; only registered tests are dispatched.
+    known_names = frozenset(known)
 
-    passed = 0
-    skipped = 0
-    failed = 0
+    try:
+        ran = iter(runner.run_selected([n for n in selected if n in known_names], args.concurrency))
+        results = [
+            next(ran) if n in known_names else TestResult(n, "fail", "unknown test name") for n in selected
+        ]
+    except BaseException:
+        # Keep partial progress visible when the run is interrupted.
+        if runner.output:
+            sys.stdout.write("\n".join(runner.output) + "\n")
+        raise
+    finally:
+        runner.client.close()
+
+    lines = runner.output
     for r in results:
         if r.status == "pass":
-            passed += 1
-            print(f"[PASS] {r.name} {('- ' + r.message) if r.message else ''}")
+            lines.append(f"[PASS] {r.name} {('- ' + r.message) if r.message else ''}")
         elif r.status == "skip":
-            skipped += 1
-            print(f"[SKIP] {r.name} - {r.message}")
+            lines.append(f"[SKIP] {r.name} - {r.message}")
         else:
-            failed += 1
-            print(f"[FAIL] {r.name} - {r.message}")
-
-    print(f"\nSummary: pass={passed} skip={skipped} fail={failed} total={len(results)}")
+            lines.append(f"[FAIL] {r.name} - {r.message}")
+
+    counts = Counter(r.status for r in results)
+    passed, skipped = counts["pass"], counts["skip"]
+    failed = len(results) - passed - skipped
+    lines.append(f"\nSummary: pass={passed} skip={skipped} fail={failed} total={len(results)}")
+    sys.stdout.write("\n".join(lines) + "\n")
+    sys.stdout.flush()
     return 1 if failed > 0 else 0
 
 
@@ -3,12 +3,17 @@
 
 from __future__ import annotations
 
-import json
+import argparse
+import io
 import sys
+import tarfile
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from pathlib import Path
 from typing import Any
 
-import yaml
+import orjson
+import pydantic
 
 ROOT = Path(__file__).resolve().parents[1]
 if str(ROOT) not in sys.path:
@@ -20,60 +25,147 @@ from integrations.mcp_server.tool_registry import (
     collect_component_schemas,
     export_mcp_tool_definition,
     get_input_schema,
+    registry_fingerprint,
 )
 
 MCP_DIR = ROOT / "integrations" / "mcp_server"
 FUNC_DIR = ROOT / "integrations" / "function_schemas"
 
+# Parameter schemas are shared by reference across operations; nothing mutates them.
+_STRING_PARAM_SCHEMA: dict[str, Any] = {"type": "string", "minLength": 1}
+_QUERY_PARAM_SCHEMAS: dict[str, dict[str, Any]] = {
+    "include_embedding": {"type": "boolean", "default": False},
+}
 
-def _write_json(path: Path, payload: Any) -> None:
-    path.parent.mkdir(parents=True, exist_ok=True)
-    path.write_text(json.dumps(payload, ensure_ascii=False, indent=2) + "\n", encoding="utf-8")
 
+def _encode_json(payload: Any) -> bytes:
+    return orjson.dumps(payload, option=orjson.OPT_INDENT_2 | orjson.OPT_APPEND_NEWLINE)
 
-def _write_yaml(path: Path, payload: Any) -> None:
-    path.parent.mkdir(parents=True, exist_ok=True)
-    path.write_text(
-        yaml.safe_dump(payload, sort_keys=False, allow_unicode=True),
-        encoding="utf-8",
-    )
+
+@lru_cache(maxsize=1)
+def _yaml_dumper() -> type:
+    # PyYAML is only needed for openapi.tools.yaml, so it is imported on first use.
+    try:
+        from yaml import CSafeDumper as base
+    except ImportError:  # PyYAML built without libyaml
+        from yaml import SafeDumper as base
+
+    class _ArtifactDumper(base):
+        """Inline shared objects; the generated OpenAPI document must not contain YAML aliases."""
+
+        def ignore_aliases(self, data: Any) -> bool:
+            return True
+
+    return _ArtifactDumper
+
+
+def _encode_yaml(payload: Any) -> bytes:
+    import yaml
+
+    return yaml.dump(payload, Dumper=_yaml_dumper(), sort_keys=False, allow_unicode=True, encoding="utf-8")
 
 
-def _operation_for(spec) -> dict[str, Any]:
+def _write_files(files: dict[Path, bytes]) -> None:
+    """Write pre-encoded artifacts; the writes are independent, so they overlap."""
+    for directory in {path.parent for path in files}:
+        directory.mkdir(parents=True, exist_ok=True)
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        for future in [pool.submit(path.write_bytes, data) for path, data in files.items()]:
+            future.result()
+
+
+def _remove_stale_schemas(files: dict[Path, bytes]) -> None:
+    """Delete per-tool schema files left behind by renamed or removed tools."""
+    for path in (MCP_DIR / "schemas").glob("*.json"):
+        if path not in files:
+            path.unlink()
+
+
+def _write_bundle(bundle_path: Path, files: dict[Path, bytes]) -> None:
+    """Pack pre-encoded artifacts into one tar archive, named relative to the repo root."""
+    buffer = io.BytesIO()
+    with tarfile.open(fileobj=buffer, mode="w") as tar:
+        for path, data in files.items():
+            info = tarfile.TarInfo(path.relative_to(ROOT).as_posix())
+            info.size = len(data)
+            info.mode = 0o644
+            tar.addfile(info, io.BytesIO(data))
+    bundle_path.parent.mkdir(parents=True, exist_ok=True)
+    bundle_path.write_bytes(buffer.getvalue())
+
+
+def _tool_summaries(mcp_tools: list[dict[str, Any]]) -> tuple[list[dict[str, Any]], dict[str, Any]]:
+    """Split the MCP catalog into compact summaries plus per-tool input schemas."""
+    summaries: list[dict[str, Any]] = []
+    schemas: dict[str, Any] = {}
+    for spec, tool in zip(TOOL_SPECS, mcp_tools):
+        schema_ref = f"schemas/{spec.name}.json"
+        schemas[schema_ref] = tool["inputSchema"]
+        summaries.append(
+            {
+                "name": spec.name,
+                "description": spec.what,
+                "x-tool-class": spec.tool_class,
+                "x-side-effectful": spec.side_effectful,
+                "x-http": tool["x-http"],
+                "schemaRef": schema_ref,
+            }
+        )
+    return summaries, schemas
+
+
+def _spec_views() -> list[dict[str, Any]]:
+    """Per-spec fields shared by the OpenAPI, function catalog, and markdown outputs."""
+    views: list[dict[str, Any]] = []
+    for spec in TOOL_SPECS:
+        expected_output: dict[str, Any] = {}
+        if spec.response_model is not None:
+            expected_output = {
+                "model": spec.response_model.__name__,
+                "$ref": f"#/components/schemas/{spec.response_model.__name__}",
+            }
+        views.append(
+            {
+                "spec": spec,
+                "description": build_tool_description(spec),
+                "expected_output": expected_output,
+                "http": {"method": spec.method, "path": spec.path},
+            }
+        )
+    return views
+
+
+def _operation_for(view: dict[str, Any]) -> dict[str, Any]:
+    spec = view["spec"]
     operation: dict[str, Any] = {
         "operationId": spec.name.replace(".", "_"),
         "summary": spec.name,
-        "description": build_tool_description(spec),
+        "description": view["description"],
         "tags": [spec.group],
         "x-tool-name": spec.name,
         "x-tool-class": spec.tool_class,
         "x-side-effectful": spec.side_effectful,
-        "x-http": {"method": spec.method, "path": spec.path},
+        "x-http": view["http"],
     }
 
-    params: list[dict[str, Any]] = []
-    for path_param in spec.path_params:
-        params.append(
-            {
-                "name": path_param,
-                "in": "path",
-                "required": True,
-                "schema": {"type": "string", "minLength": 1},
-            }
-        )
-    for query_param in spec.query_params:
-        if query_param == "include_embedding":
-            schema = {"type": "boolean", "default": False}
-        else:
-            schema = {"type": "string", "minLength": 1}
-        params.append(
-            {
-                "name": query_param,
-                "in": "query",
-                "required": False,
-                "schema": schema,
-            }
-        )
+    params: list[dict[str, Any]] = [
+        {
+            "name": path_param,
+            "in": "path",
+            "required": True,
+            "schema": _STRING_PARAM_SCHEMA,
+        }
+        for path_param in spec.path_params
+    ]
+    params.extend(
+        {
+            "name": query_param,
+            "in": "query",
+            "required": False,
+            "schema": _QUERY_PARAM_SCHEMAS.get(query_param, _STRING_PARAM_SCHEMA),
+        }
+        for query_param in spec.query_params
+    )
     if params:
         operation["parameters"] = params
 
@@ -88,13 +180,9 @@ def _operation_for(spec) -> dict[str, Any]:
         }
 
     response_schema: dict[str, Any] = {"type": "object"}
-    expected_output: dict[str, Any] = {}
-    if spec.response_model is not None:
-        response_schema = {"$ref": f"#/components/schemas/{spec.response_model.__name__}"}
-        expected_output = {
-            "model": spec.response_model.__name__,
-            "$ref": f"#/components/schemas/{spec.response_model.__name__}",
-        }
+    expected_output = view["expected_output"]
+    if expected_output:
+        response_schema = {"$ref": expected_output["$ref"]}
 
     operation["responses"] = {
         "200": {
@@ -107,12 +195,14 @@ def _operation_for(spec) -> dict[str, Any]:
     return operation
 
 
-def _build_openapi(components: dict[str, Any]) -> dict[str, Any]:
+def _build_openapi(components: dict[str, Any], views: list[dict[str, Any]]) -> dict[str, Any]:
     paths: dict[str, Any] = {}
-    for spec in TOOL_SPECS:
-        op = _operation_for(spec)
-        path_item = paths.setdefault(spec.path, {})
-        path_item[spec.method.lower()] = op
+    for view in views:
+        spec = view["spec"]
+        path_item = paths.get(spec.path)
+        if path_item is None:
+            path_item = paths[spec.path] = {}
+        path_item[spec.method.lower()] = _operation_for(view)
 
     return {
         "openapi": "3.1.0",
@@ -127,33 +217,28 @@ def _build_openapi(components: dict[str, Any]) -> dict[str, Any]:
     }
 
 
-def _build_functions_catalog() -> list[dict[str, Any]]:
+def _build_functions_catalog(views: list[dict[str, Any]]) -> list[dict[str, Any]]:
     catalog: list[dict[str, Any]] = []
-    for spec in TOOL_SPECS:
-        expected_output = {}
-        if spec.response_model is not None:
-            expected_output = {
-                "model": spec.response_model.__name__,
-                "$ref": f"#/components/schemas/{spec.response_model.__name__}",
-            }
+    for view in views:
+        spec = view["spec"]
         catalog.append(
             {
                 "type": "function",
                 "function": {
                     "name": spec.name,
-                    "description": build_tool_description(spec),
+                    "description": view["description"],
                     "parameters": get_input_schema(spec),
                 },
                 "x-tool-class": spec.tool_class,
                 "x-side-effectful": spec.side_effectful,
-                "x-http": {"method": spec.method, "path": spec.path},
-                "x-expected-output": expected_output,
+                "x-http": view["http"],
+                "x-expected-output": view["expected_output"],
             }
         )
     return catalog
 
 
-def _build_descriptions_md() -> str:
+def _build_descriptions_md(views: list[dict[str, Any]]) -> str:
     lines: list[str] = []
     lines.append("# CXXtract2 Agent Tool Guidance")
     lines.append("")
@@ -168,15 +253,15 @@ def _build_descriptions_md() -> str:
     lines.append("")
     lines.append("## Tool Descriptions")
     lines.append("")
-    for spec in TOOL_SPECS:
-        lines.append(f"### `{spec.name}`")
-        lines.append("")
-        lines.append(f"- Class: `{spec.tool_class}`")
-        lines.append(f"- Side effectful: `{str(spec.side_effectful).lower()}`")
-        lines.append(f"- HTTP: `{spec.method} {spec.path}`")
-        lines.append("")
-        lines.append(build_tool_description(spec))
-        lines.append("")
+    for view in views:
+        spec = view["spec"]
+        lines.append(
+            f"### `{spec.name}`\n\n"
+            f"- Class: `{spec.tool_class}`\n"
+            f"- Side effectful: `{str(spec.side_effectful).lower()}`\n"
+            f"- HTTP: `{spec.method} {spec.path}`\n\n"
+            f"{view['description']}\n"
+        )
     return "\n".join(lines).strip() + "\n"
 
 
@@ -188,12 +273,21 @@ def _readme_mcp() -> str:
         "- `server.py`: MCP stdio server (`initialize`, `tools/list`, `tools/call`).\n"
         "- `tool_registry.py`: canonical 30-tool catalog + schemas + descriptions.\n"
         "- `http_client.py`: validated HTTP dispatch with timeout/retry profiles.\n"
-        "- `schema_components.json`: shared component schemas.\n\n"
+        "- `schema_components.json`: shared component schemas.\n"
+        "- `tools.catalog.json`: full `tools/list` payload (every tool with its input schema),\n"
+        "  stamped with a registry `fingerprint`; the server regenerates the payload when it is stale.\n"
+        "- `tools.summaries.json`: name, one-line purpose, and HTTP route per tool, with a\n"
+        "  `schemaRef` to `schemas/<tool>.json` so agents can load input schemas on demand.\n\n"
         "## Run\n\n"
         "```powershell\n"
         "python integrations/mcp_server/server.py\n"
         "```\n\n"
-        "Configure target API base URL with `CXXTRACT_BASE_URL`.\n"
+        "`tools/call` results mirror `structuredContent` as compact JSON in their text content block.\n\n"
+        "## Environment\n\n"
+        "- `CXXTRACT_BASE_URL`: target API base URL (default `http://127.0.0.1:8000`).\n"
+        "- `CXXTRACT_MCP_WORKERS`: maximum tool calls in flight against the API at once (default `16`).\n"
+        "- `CXXTRACT_MCP_HTTP2`: set to `true` to multiplex calls over one HTTP/2 connection when the API\n"
+        "  sits behind a TLS proxy that negotiates h2 (default `false`; requires `httpx[http2]`).\n"
     )
 
 
@@ -213,21 +307,50 @@ def _readme_functions() -> str:
     )
 
 
-def main() -> None:
+def _parse_args(argv: list[str] | None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "--bundle",
+        type=Path,
+        default=None,
+        help="Write all artifacts into this tar archive instead of the source tree.",
+    )
+    return parser.parse_args(argv)
+
+
+def main(argv: list[str] | None = None) -> None:
+    args = _parse_args(argv)
     components = collect_component_schemas()
 
     mcp_tools = [export_mcp_tool_definition(spec) for spec in TOOL_SPECS]
-    _write_json(MCP_DIR / "schema_components.json", components)
-    _write_json(MCP_DIR / "tools.catalog.json", {"tools": mcp_tools})
-    (MCP_DIR / "README.md").write_text(_readme_mcp(), encoding="utf-8")
-
-    functions_catalog = _build_functions_catalog()
-    openapi_doc = _build_openapi(components)
-    _write_json(FUNC_DIR / "components.common.json", {"components": {"schemas": components}})
-    _write_json(FUNC_DIR / "functions.catalog.json", {"functions": functions_catalog})
-    _write_yaml(FUNC_DIR / "openapi.tools.yaml", openapi_doc)
-    (FUNC_DIR / "descriptions.md").write_text(_build_descriptions_md(), encoding="utf-8")
-    (FUNC_DIR / "README.md").write_text(_readme_functions(), encoding="utf-8")
+    summaries, tool_schemas = _tool_summaries(mcp_tools)
+
+    # Descriptions and shared per-spec fields are computed once for all outputs.
+    views = _spec_views()
+    functions_catalog = _build_functions_catalog(views)
+    openapi_doc = _build_openapi(components, views)
+
+    # Encode everything first so a failure never leaves a half-written bundle.
+    files = {
+        MCP_DIR / "schema_components.json": _encode_json(components),
+        MCP_DIR / "tools.catalog.json": _encode_json(
+            {"fingerprint": registry_fingerprint(), "pydantic_version": pydantic.VERSION, "tools": mcp_tools}
+        ),
+        MCP_DIR / "tools.summaries.json": _encode_json({"tools": summaries}),
+        **{MCP_DIR / ref: _encode_json(schema) for ref, schema in tool_schemas.items()},
+        MCP_DIR / "README.md": _readme_mcp().encode("utf-8"),
+        FUNC_DIR / "components.common.json": _encode_json({"components": {"schemas": components}}),
+        FUNC_DIR / "functions.catalog.json": _encode_json({"functions": functions_catalog}),
+        FUNC_DIR / "openapi.tools.yaml": _encode_yaml(openapi_doc),
+        FUNC_DIR / "descriptions.md": _build_descriptions_md(views).encode("utf-8"),
+        FUNC_DIR / "README.md": _readme_functions().encode("utf-8"),
+    }
+    if args.bundle is not None:
+        _write_bundle(args.bundle, files)
+        print(f"Generated agent artifact bundle at: {args.bundle}")
+        return
+    _write_files(files)
+    _remove_stale_schemas(files)
 
     print(f"Generated MCP bundle at: {MCP_DIR}")
     print(f"Generated function schema bundle at: {FUNC_DIR}")
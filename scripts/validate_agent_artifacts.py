@@ -9,13 +9,18 @@ import sys
 from pathlib import Path
 from typing import Any
 
-import yaml
-
 ROOT = Path(__file__).resolve().parents[1]
 if str(ROOT) not in sys.path:
     sys.path.insert(0, str(ROOT))
 
-from integrations.mcp_server.tool_registry import TOOL_SPECS, route_inventory
+from integrations.mcp_server.tool_registry import (
+    TOOL_SPECS,
+    iter_side_effectful,
+    registry_fingerprint,
+    route_inventory,
+)
+
+_ROUTE_RE = re.compile(r'@router\.(get|post)\(\s*"([^"]+)"', re.DOTALL)
 
 
 def _read_text(path: Path) -> str:
@@ -24,19 +29,26 @@ def _read_text(path: Path) -> str:
     return path.read_text(encoding="utf-8")
 
 
-def _route_inventory_from_routes_py(path: Path) -> set[tuple[str, str]]:
+def _route_inventory_from_routes_py(path: Path) -> frozenset[tuple[str, str]]:
     text = _read_text(path)
-    pattern = re.compile(r'@router\.(get|post)\(\s*"([^"]+)"', re.DOTALL)
-    out: set[tuple[str, str]] = set()
-    for method, route in pattern.findall(text):
-        out.add((method.upper(), route))
-    return out
+    return frozenset((m.group(1).upper(), m.group(2)) for m in _ROUTE_RE.finditer(text))
 
 
 def _load_json(path: Path) -> Any:
     return json.loads(_read_text(path))
 
 
+def _load_yaml(path: Path) -> Any:
+    # Imported lazily: PyYAML is only needed for the OpenAPI document.
+    import yaml
+
+    try:
+        from yaml import CSafeLoader as loader
+    except ImportError:  # PyYAML built without libyaml
+        from yaml import SafeLoader as loader
+    return yaml.load(_read_text(path), Loader=loader)
+
+
 def _validate() -> None:
     expected_tools = {spec.name for spec in TOOL_SPECS}
     if len(expected_tools) != 30:
@@ -52,12 +64,13 @@ def _validate() -> None:
 
     mcp_schema = ROOT / "integrations" / "mcp_server" / "schema_components.json"
     mcp_catalog = ROOT / "integrations" / "mcp_server" / "tools.catalog.json"
+    mcp_summaries = ROOT / "integrations" / "mcp_server" / "tools.summaries.json"
     openapi_path = ROOT / "integrations" / "function_schemas" / "openapi.tools.yaml"
     func_catalog = ROOT / "integrations" / "function_schemas" / "functions.catalog.json"
     common_json = ROOT / "integrations" / "function_schemas" / "components.common.json"
     descriptions_md = ROOT / "integrations" / "function_schemas" / "descriptions.md"
 
-    for path in (mcp_schema, mcp_catalog, openapi_path, func_catalog, common_json, descriptions_md):
+    for path in (mcp_schema, mcp_catalog, mcp_summaries, openapi_path, func_catalog, common_json, descriptions_md):
         if not path.exists():
             raise RuntimeError(f"artifact missing: {path}")
 
@@ -66,6 +79,21 @@ def _validate() -> None:
     tool_names = {entry.get("name", "") for entry in tools}
     if tool_names != expected_tools:
         raise RuntimeError("MCP catalog tool names do not match registry")
+    if tools_doc.get("fingerprint") != registry_fingerprint():
+        raise RuntimeError("MCP catalog fingerprint is stale; regenerate artifacts")
+
+    summaries = _load_json(mcp_summaries).get("tools", [])
+    if {entry.get("name", "") for entry in summaries} != expected_tools:
+        raise RuntimeError("MCP tool summaries do not match registry")
+    schemas_by_name = {entry.get("name", ""): entry.get("inputSchema") for entry in tools}
+    schema_files = {path.name for path in (mcp_catalog.parent / "schemas").glob("*")}
+    unexpected = sorted(schema_files - {f"{name}.json" for name in expected_tools})
+    if unexpected:
+        raise RuntimeError(f"unexpected files in MCP schemas directory: {unexpected}")
+    for entry in summaries:
+        schema_path = mcp_catalog.parent / str(entry.get("schemaRef", ""))
+        if _load_json(schema_path) != schemas_by_name[entry["name"]]:
+            raise RuntimeError(f"input schema file out of date for tool: {entry['name']}")
 
     funcs_doc = _load_json(func_catalog)
     functions = funcs_doc.get("functions", [])
@@ -73,7 +101,7 @@ def _validate() -> None:
     if func_names != expected_tools:
         raise RuntimeError("Function catalog tool names do not match registry")
 
-    openapi_doc = yaml.safe_load(_read_text(openapi_path))
+    openapi_doc = _load_yaml(openapi_path)
     ops: set[str] = set()
     for path_item in openapi_doc.get("paths", {}).values():
         if not isinstance(path_item, dict):
@@ -84,7 +112,7 @@ def _validate() -> None:
     if ops != expected_tools:
         raise RuntimeError("OpenAPI tool names do not match registry")
 
-    mutating_tools = [spec.name for spec in TOOL_SPECS if spec.side_effectful]
+    mutating_tools = {spec.name for spec in iter_side_effectful()}
     for entry in tools:
         name = entry.get("name", "")
         side = bool(entry.get("x-side-effectful", False))
@@ -2,9 +2,11 @@
 
 from __future__ import annotations
 
+import asyncio
 import logging
 import shutil
-from typing import Annotated
+import time
+from typing import Annotated, Any
 
 from fastapi import APIRouter, Depends, HTTPException, Query, Request
 
@@ -70,7 +72,8 @@ logger = logging.getLogger(__name__)
 router = APIRouter()
 
 
-def _get_engine(request: Request) -> OrchestratorEngine:
+async def _get_engine(request: Request) -> OrchestratorEngine:
+    # Async so FastAPI calls it inline; sync dependencies are dispatched to the threadpool.
     return request.app.state.engine  # type: ignore[return-value]
 
 
@@ -314,60 +317,81 @@ async def get_commit_diff_summary(
         raise HTTPException(status_code=422, detail=str(exc)) from exc
 
 
-@router.get("/health", response_model=HealthResponse, tags=["health"])
-async def health(request: Request) -> HealthResponse:
-    settings = request.app.state.settings
-    writer = getattr(request.app.state, "writer", None)
+def _health_static_fields(state: Any) -> dict[str, Any]:
+    """Health fields that stay fixed once the app has started."""
+    settings = state.settings
+    rg_version: str = getattr(state, "rg_version", "")
+    # Resolved once by the lifespan; fall back to a PATH lookup when it did not run.
+    rg_available = getattr(state, "rg_available", None)
+    if rg_available is None:
+        rg_available = bool(rg_version) or shutil.which(settings.rg_binary) is not None
+    extractor_available = getattr(state, "extractor_available", None)
+    if extractor_available is None:
+        extractor_available = shutil.which(settings.extractor_binary) is not None
+    return {
+        "status": "ok",
+        "version": __version__,
+        "rg_available": rg_available,
+        "rg_version": rg_version,
+        "extractor_available": extractor_available,
+        "sqlite_vec_loaded": is_sqlite_vec_loaded(),
+    }
+
+
+async def _collect_health_metrics() -> tuple[Any, ...]:
+    """Read the /health counters; the reads are independent, and a failing one reports zero."""
+    metrics = await asyncio.gather(
+        repo.count_tracked_files(),
+        repo.count_symbols(),
+        repo.count_active_contexts(),
+        repo.get_overlay_disk_usage_bytes(),
+        repo.get_index_queue_depth(),
+        repo.get_oldest_pending_job_age_s(),
+        repo.get_repo_sync_queue_depth(),
+        repo.get_active_sync_jobs(),
+        repo.get_sync_failures_last_hour(),
+        return_exceptions=True,
+    )
+    return tuple(
+        default if isinstance(value, Exception) else value
+        for value, default in zip(metrics, (0, 0, 0, 0, 0, 0.0, 0, 0, 0))
+    )
 
-    rg_version: str = getattr(request.app.state, "rg_version", "")
-    rg_available = bool(rg_version) or shutil.which(settings.rg_binary) is not None
-    extractor_available = shutil.which(settings.extractor_binary) is not None
 
-    try:
-        file_count = await repo.count_tracked_files()
-    except Exception:
-        file_count = 0
-    try:
-        symbol_count = await repo.count_symbols()
-    except Exception:
-        symbol_count = 0
-    try:
-        active_context_count = await repo.count_active_contexts()
-    except Exception:
-        active_context_count = 0
-    try:
-        overlay_disk = await repo.get_overlay_disk_usage_bytes()
-    except Exception:
-        overlay_disk = 0
-    try:
-        index_depth = await repo.get_index_queue_depth()
-    except Exception:
-        index_depth = 0
-    try:
-        oldest_pending = await repo.get_oldest_pending_job_age_s()
-    except Exception:
-        oldest_pending = 0.0
-    try:
-        sync_queue_depth = await repo.get_repo_sync_queue_depth()
-    except Exception:
-        sync_queue_depth = 0
-    try:
-        active_sync_jobs = await repo.get_active_sync_jobs()
-    except Exception:
-        active_sync_jobs = 0
-    try:
-        sync_failures_1h = await repo.get_sync_failures_last_hour()
-    except Exception:
-        sync_failures_1h = 0
+@router.get("/health", response_model=HealthResponse, tags=["health"])
+async def health(request: Request) -> HealthResponse:
+    state = request.app.state
+    writer = getattr(state, "writer", None)
+    static = getattr(state, "health_static", None)
+    if static is None:
+        static = state.health_static = _health_static_fields(state)
+
+    # When health_metrics_ttl_ms > 0, reuse the counters for that long.
+    now = time.monotonic()
+    cached = getattr(state, "health_metrics", None)
+    if cached is not None and now < cached[0]:
+        metrics = cached[1]
+    else:
+        metrics = await _collect_health_metrics()
+        ttl_s = state.settings.health_metrics_ttl_ms / 1000.0
+        if ttl_s > 0:
+            state.health_metrics = (now + ttl_s, metrics)
+    (
+        file_count,
+        symbol_count,
+        active_context_count,
+        overlay_disk,
+        index_depth,
+        oldest_pending,
+        sync_queue_depth,
+        active_sync_jobs,
+        sync_failures_1h,
+    ) = metrics
 
     return HealthResponse(
-        status="ok",
-        version=__version__,
+        **static,
         cache_file_count=file_count,
         cache_symbol_count=symbol_count,
-        rg_available=rg_available,
-        rg_version=rg_version,
-        extractor_available=extractor_available,
         writer_queue_depth=getattr(writer, "queue_depth", 0),
         writer_lag_ms=getattr(writer, "lag_ms", 0.0),
         active_context_count=active_context_count,
@@ -377,5 +401,4 @@ async def health(request: Request) -> HealthResponse:
         sync_queue_depth=sync_queue_depth,
         active_sync_jobs=active_sync_jobs,
         last_sync_failure_count_1h=sync_failures_1h,
-        sqlite_vec_loaded=is_sqlite_vec_loaded(),
     )
@@ -442,6 +442,11 @@ async def upsert_parse_payload(
     db = conn or get_connection()
     now = _utc_now()
     try:
+        cur = await db.execute(
+            "SELECT 1 FROM tracked_files WHERE context_id = ? AND file_key = ?",
+            (payload.context_id, payload.file_key),
+        )
+        new_file = await cur.fetchone() is None
         await db.execute(
             """
             INSERT INTO tracked_files (
@@ -501,6 +506,19 @@ async def upsert_parse_payload(
                 ],
             )
 
+        # cache_stats only has DELETE triggers (deletes also arrive via cascades);
+        # inserts are counted here once per payload instead of once per row. Every
+        # insert into tracked_files/symbols must go through this function, or the
+        # /health totals drift.
+        await db.execute(
+            """
+            UPDATE cache_stats
+            SET value = value + CASE key WHEN 'tracked_files' THEN ? ELSE ? END
+            WHERE key IN ('tracked_files', 'symbols')
+            """,
+            (int(new_file), len(payload.output.symbols)),
+        )
+
         if payload.output.references:
             await db.executemany(
                 """
@@ -629,7 +647,8 @@ async def count_tracked_files(
     if context_id:
         cur = await db.execute("SELECT COUNT(*) FROM tracked_files WHERE context_id = ?", (context_id,))
     else:
-        cur = await db.execute("SELECT COUNT(*) FROM tracked_files")
+        # Whole-cache totals come from cache_stats (see upsert_parse_payload).
+        cur = await db.execute("SELECT value FROM cache_stats WHERE key = 'tracked_files'")
     row = await cur.fetchone()
     return row[0] if row else 0  # type: ignore[index]
 
@@ -643,7 +662,7 @@ async def count_symbols(
     if context_id:
         cur = await db.execute("SELECT COUNT(*) FROM symbols WHERE context_id = ?", (context_id,))
     else:
-        cur = await db.execute("SELECT COUNT(*) FROM symbols")
+        cur = await db.execute("SELECT value FROM cache_stats WHERE key = 'symbols'")
     row = await cur.fetchone()
     return row[0] if row else 0  # type: ignore[index]
 
@@ -44,6 +44,7 @@ class Settings(BaseSettings):
     # -- Server ---------------------------------------------------------------
     host: str = "127.0.0.1"
     port: int = 8000
+    health_metrics_ttl_ms: int = 0
 
     # -- Overlay controls -----------------------------------------------------
     max_overlay_files: int = 5000
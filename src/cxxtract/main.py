@@ -3,6 +3,7 @@
 from __future__ import annotations
 
 import logging
+import shutil
 import sys
 from contextlib import asynccontextmanager
 from pathlib import Path
@@ -50,6 +51,10 @@ async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
             "but cached results can still be served"
         )
 
+    # Binary availability is fixed for the process; /health reads these flags.
+    app.state.rg_available = bool(app.state.rg_version) or shutil.which(settings.rg_binary) is not None
+    app.state.extractor_available = shutil.which(settings.extractor_binary) is not None
+
     # Ensure sqlite-vec is available (auto-detect/auto-install) when enabled
     ensure_sqlite_vec(settings)
 
@@ -195,3 +195,31 @@ CREATE TABLE IF NOT EXISTS index_jobs (
 
 CREATE INDEX IF NOT EXISTS idx_index_jobs_status_created
     ON index_jobs(status, created_at);
+
+-- ============================================================
+-- Running row counts for /health
+-- ============================================================
+-- Inserts are counted by upsert_parse_payload() once per payload; only
+-- deletes (including FK cascades) go through per-row triggers. Every insert
+-- into tracked_files/symbols must go through that function, or the totals drift.
+CREATE TABLE IF NOT EXISTS cache_stats (
+    key    TEXT PRIMARY KEY,
+    value  INTEGER NOT NULL DEFAULT 0
+);
+
+-- Seed once from the existing rows; later startups skip the COUNT(*).
+INSERT INTO cache_stats (key, value)
+    SELECT 'tracked_files', (SELECT COUNT(*) FROM tracked_files)
+    WHERE NOT EXISTS (SELECT 1 FROM cache_stats WHERE key = 'tracked_files');
+INSERT INTO cache_stats (key, value)
+    SELECT 'symbols', (SELECT COUNT(*) FROM symbols)
+    WHERE NOT EXISTS (SELECT 1 FROM cache_stats WHERE key = 'symbols');
+
+CREATE TRIGGER IF NOT EXISTS trg_tracked_files_stats_delete AFTER DELETE ON tracked_files
+BEGIN
+    UPDATE cache_stats SET value = value - 1 WHERE key = 'tracked_files';
+END;
+CREATE TRIGGER IF NOT EXISTS trg_symbols_stats_delete AFTER DELETE ON symbols
+BEGIN
+    UPDATE cache_stats SET value = value - 1 WHERE key = 'symbols';
+END;
@@ -3,9 +3,24 @@ from __future__ import annotations
 import json
 from pathlib import Path
 
+import orjson
+import pytest
 import yaml
 
-from integrations.mcp_server.tool_registry import TOOL_SPECS, build_tool_description, route_inventory
+from integrations.mcp_server import tool_registry
+from integrations.mcp_server.tool_registry import (
+    TOOL_SPECS,
+    build_tool_description,
+    collect_component_schemas,
+    export_mcp_tool_definition,
+    get_input_schema,
+    get_tool_spec,
+    get_tools_list_json,
+    iter_side_effectful,
+    registry_fingerprint,
+    route_inventory,
+    validate_arguments,
+)
 
 
 ROOT = Path(__file__).resolve().parents[1]
@@ -19,6 +34,90 @@ def test_tool_registry_covers_expected_surface():
         assert spec.name.startswith("cxxtract.")
         assert spec.method in {"GET", "POST"}
         assert spec.path.startswith("/")
+        assert spec.path_keys == spec.path_params
+        assert len(spec.path_literals) == len(spec.path_keys) + 1
+        assert spec.routed_params == set(spec.path_params) | set(spec.query_params)
+
+
+def test_get_tool_spec_resolves_every_registered_name():
+    for spec in TOOL_SPECS:
+        assert get_tool_spec(spec.name) is spec
+    assert get_tool_spec("cxxtract.unknown") is None
+
+
+def test_cached_schemas_are_copied_at_public_boundary():
+    spec = get_tool_spec("cxxtract.explore.read_file")
+    assert spec is not None
+    schema = get_input_schema(spec)
+    schema["properties"].clear()
+    assert get_input_schema(spec)["properties"]
+
+    tool = export_mcp_tool_definition(spec)
+    tool["inputSchema"]["required"].append("bogus")
+    assert "bogus" not in export_mcp_tool_definition(spec)["inputSchema"]["required"]
+
+
+def test_tools_list_json_matches_exported_definitions(monkeypatch):
+    live = [export_mcp_tool_definition(spec) for spec in TOOL_SPECS]
+    # The prebuilt catalog must match live generation, or regenerate artifacts.
+    assert json.loads(get_tools_list_json()) == live
+
+    monkeypatch.setattr(tool_registry, "_PREBUILT_TOOLS_CATALOG", ROOT / "missing.catalog.json")
+    get_tools_list_json.cache_clear()
+    try:
+        assert json.loads(get_tools_list_json()) == live
+    finally:
+        get_tools_list_json.cache_clear()
+
+
+@pytest.mark.parametrize(
+    "stamp",
+    [
+        {"fingerprint": "stale"},
+        {"fingerprint": registry_fingerprint(), "pydantic_version": "0.0.0"},
+    ],
+)
+def test_tools_list_json_ignores_stale_catalog(monkeypatch, tmp_path, stamp):
+    stale = tmp_path / "tools.catalog.json"
+    stale.write_bytes(orjson.dumps({**stamp, "tools": [{"name": spec.name} for spec in TOOL_SPECS]}))
+    monkeypatch.setattr(tool_registry, "_PREBUILT_TOOLS_CATALOG", stale)
+    get_tools_list_json.cache_clear()
+    try:
+        assert json.loads(get_tools_list_json()) == [export_mcp_tool_definition(spec) for spec in TOOL_SPECS]
+    finally:
+        get_tools_list_json.cache_clear()
+
+
+def test_registry_fingerprint_is_none_without_module_source(monkeypatch):
+    monkeypatch.delattr(tool_registry.sys.modules[tool_registry.__name__], "__file__")
+    registry_fingerprint.cache_clear()
+    try:
+        assert registry_fingerprint() is None
+    finally:
+        monkeypatch.undo()
+        registry_fingerprint.cache_clear()
+    assert registry_fingerprint() is not None
+
+
+def test_validate_arguments_returns_dict_body_unless_model_requested():
+    spec = get_tool_spec("cxxtract.explore.read_file")
+    assert spec is not None
+    args = {"workspace_id": "ws1", "file_key": "repoA:src/main.cpp"}
+
+    body = validate_arguments(spec, args, dump_body=False)["body"]
+    assert isinstance(body, spec.request_model)
+    dumped = validate_arguments(spec, args)["body"]
+    assert dumped == body.model_dump(mode="json") and dumped["max_bytes"] == 65536
+
+
+def test_iter_side_effectful_matches_spec_flags():
+    assert list(iter_side_effectful()) == [spec for spec in TOOL_SPECS if spec.side_effectful]
+
+
+def test_component_schemas_are_stable_across_calls():
+    first = collect_component_schemas()
+    first.clear()
+    assert collect_component_schemas() == collect_component_schemas() != first
 
 
 def test_tool_descriptions_include_agent_guidance_sections():
@@ -45,6 +144,7 @@ def test_generated_catalogs_exist_and_match_registry():
     mcp_catalog = json.loads(mcp_catalog_path.read_text(encoding="utf-8"))
     mcp_names = {entry["name"] for entry in mcp_catalog["tools"]}
     assert mcp_names == expected
+    assert mcp_catalog["fingerprint"] == registry_fingerprint()
 
     fn_catalog = json.loads(fn_catalog_path.read_text(encoding="utf-8"))
     fn_names = {entry["function"]["name"] for entry in fn_catalog["functions"]}
@@ -61,6 +161,19 @@ def test_generated_catalogs_exist_and_match_registry():
     assert op_names == expected
 
 
+def test_tool_summaries_point_at_current_input_schemas():
+    mcp_dir = ROOT / "integrations" / "mcp_server"
+    summaries = json.loads((mcp_dir / "tools.summaries.json").read_text(encoding="utf-8"))["tools"]
+    assert [entry["name"] for entry in summaries] == [spec.name for spec in TOOL_SPECS]
+    for spec, entry in zip(TOOL_SPECS, summaries):
+        assert "inputSchema" not in entry
+        assert entry["description"] == spec.what
+        schema = json.loads((mcp_dir / entry["schemaRef"]).read_text(encoding="utf-8"))
+        assert schema == get_input_schema(spec)
+    schema_files = {path.name for path in (mcp_dir / "schemas").iterdir()}
+    assert schema_files == {f"{spec.name}.json" for spec in TOOL_SPECS}
+
+
 def test_tool_routes_match_router_inventory():
     route_file = ROOT / "src" / "cxxtract" / "api" / "routes.py"
     text = route_file.read_text(encoding="utf-8")
@@ -178,7 +178,7 @@ def mock_engine():
 
 
 @pytest.fixture
-async def client(settings: Settings, mock_engine):
+def app(settings: Settings, mock_engine):
     from contextlib import asynccontextmanager
 
     @asynccontextmanager
@@ -190,7 +190,11 @@ async def client(settings: Settings, mock_engine):
     app.state.settings = settings
     app.state.engine = mock_engine
     app.state.rg_version = "ripgrep 14.0.0"
+    return app
 
+
+@pytest.fixture
+async def client(app):
     transport = ASGITransport(app=app)
     async with AsyncClient(transport=transport, base_url="http://test") as ac:
         yield ac
@@ -210,6 +214,44 @@ class TestHealthEndpoint:
         assert data["cache_file_count"] == 5
         assert data["cache_symbol_count"] == 42
 
+    async def test_health_defaults_only_failing_metrics(self, client: AsyncClient):
+        with patch("cxxtract.api.routes.repo.count_tracked_files", AsyncMock(return_value=5)), patch(
+            "cxxtract.api.routes.repo.count_symbols", AsyncMock(side_effect=RuntimeError("db busy"))
+        ), patch("cxxtract.api.routes.repo.get_oldest_pending_job_age_s", AsyncMock(return_value=1.5)):
+            resp = await client.get("/health")
+
+        assert resp.status_code == 200
+        data = resp.json()
+        assert data["cache_file_count"] == 5
+        assert data["cache_symbol_count"] == 0
+        assert data["oldest_pending_job_age_s"] == 1.5
+
+    async def test_health_uses_startup_binary_flags(self, client: AsyncClient, app):
+        app.state.rg_available = False
+        app.state.extractor_available = True
+        with patch("cxxtract.api.routes.shutil.which") as which:
+            resp = await client.get("/health")
+
+        data = resp.json()
+        assert data["rg_available"] is False
+        assert data["extractor_available"] is True
+        which.assert_not_called()
+        assert app.state.health_static["rg_version"] == "ripgrep 14.0.0"
+
+    async def test_health_reuses_metrics_within_ttl(self, client: AsyncClient, settings: Settings):
+        count_files = AsyncMock(return_value=5)
+        with patch("cxxtract.api.routes.repo.count_tracked_files", count_files):
+            # Disabled by default: every request re-reads the counters.
+            await client.get("/health")
+            await client.get("/health")
+            assert count_files.await_count == 2
+
+            settings.health_metrics_ttl_ms = 2000
+            first = (await client.get("/health")).json()
+            second = (await client.get("/health")).json()
+            assert count_files.await_count == 3
+            assert first["cache_file_count"] == second["cache_file_count"] == 5
+
 
 class TestQueryContracts:
 
@@ -221,6 +263,20 @@ class TestQueryContracts:
         assert resp.status_code == 200
         mock_engine.query_references.assert_awaited_once()
 
+    async def test_engine_dependency_can_be_overridden(self, client: AsyncClient, app, mock_engine):
+        from cxxtract.api.routes import _get_engine
+
+        override = MagicMock()
+        override.query_references = AsyncMock(return_value=mock_engine.query_references.return_value)
+        app.dependency_overrides[_get_engine] = lambda: override
+        resp = await client.post(
+            "/query/references",
+            json={"symbol": "Session::Auth", "workspace_id": "ws_main"},
+        )
+        assert resp.status_code == 200
+        override.query_references.assert_awaited_once()
+        mock_engine.query_references.assert_not_awaited()
+
     async def test_definition_valid(self, client: AsyncClient, mock_engine):
         resp = await client.post(
             "/query/definition",
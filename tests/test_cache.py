@@ -277,6 +277,28 @@ class TestMetrics:
         assert leased["status"] == "running"
         assert await repo.get_active_sync_jobs() >= 1
 
+    async def test_cache_stats_track_row_counts(self, db_conn: aiosqlite.Connection, tmp_path: Path):
+        async def scanned(table: str) -> int:
+            cur = await db_conn.execute(f"SELECT COUNT(*) FROM {table}")
+            return (await cur.fetchone())[0]
+
+        context_id = await _bootstrap_workspace(tmp_path)
+        src = tmp_path / "repos" / "repoA" / "src" / "a.cpp"
+        src.parent.mkdir(parents=True, exist_ok=True)
+        src.write_text("int foo() { return 1; }")
+        payload = await _make_payload(context_id, "repoA:src/a.cpp", "repoA", "src/a.cpp", str(src).replace("\\", "/"))
+
+        # Re-parsing replaces the file's symbols; the running totals must not drift.
+        await repo.upsert_parse_payload(payload)
+        await repo.upsert_parse_payload(payload)
+        assert await repo.count_tracked_files() == await scanned("tracked_files") == 1
+        assert await repo.count_symbols() == await scanned("symbols") > 0
+
+        # Cascaded deletes from tracked_files fire the symbols trigger too.
+        await repo.clear_context(context_id)
+        assert await repo.count_tracked_files() == 0
+        assert await repo.count_symbols() == await scanned("symbols") == 0
+
 
 class TestRepoSyncState:
 
@@ -35,6 +35,7 @@ class TestSettingsDefaults:
         assert s.parse_timeout_s == 120
         assert s.host == "127.0.0.1"
         assert s.port == 8000
+        assert s.health_metrics_ttl_ms == 0
 
     def test_constructor_kwargs_override(self):
         s = Settings(
@@ -0,0 +1,187 @@
+"""Tests for the MCP HTTP dispatch client."""
+
+from __future__ import annotations
+
+import asyncio
+
+import httpx
+import orjson
+import pytest
+
+from integrations.mcp_server.http_client import CxxtractHttpClient, HttpToolError
+from integrations.mcp_server.tool_registry import get_tool_spec, validate_arguments
+
+
+def _client_with(handler) -> CxxtractHttpClient:
+    client = CxxtractHttpClient(base_url="http://cxxtract.test")
+    client._client = httpx.AsyncClient(base_url=client.base_url, transport=httpx.MockTransport(handler))
+    return client
+
+
+async def test_call_reuses_shared_client_and_formats_path():
+    seen: list[str] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        seen.append(str(request.url))
+        return httpx.Response(200, json={"found": False})
+
+    spec = get_tool_spec("cxxtract.vector.get")
+    assert spec is not None
+    validated = validate_arguments(
+        spec,
+        {"workspace_id": "ws/1", "repo_id": "repoA", "commit_sha": "a" * 40, "include_embedding": True},
+    )
+    async with _client_with(handler) as client:
+        first = await client.call(spec=spec, validated=validated, request_id=1)
+        second = await client.call(spec=spec, validated=validated, request_id=2)
+
+    assert isinstance(first, bytes)
+    assert orjson.loads(first) == orjson.loads(second) == {"found": False}
+    assert seen[0] == seen[1]
+    assert seen[0].startswith("http://cxxtract.test/commit-diff-summaries/ws%2F1/repoA/")
+    assert "include_embedding=true" in seen[0]
+
+
+async def test_call_posts_orjson_encoded_body():
+    seen: list[httpx.Request] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        seen.append(request)
+        return httpx.Response(200, json={"ok": True})
+
+    spec = get_tool_spec("cxxtract.explore.read_file")
+    assert spec is not None
+    validated = validate_arguments(spec, {"workspace_id": "ws1", "file_key": "repoA:src/main.cpp"}, dump_body=False)
+    async with _client_with(handler) as client:
+        await client.call(spec=spec, validated=validated, request_id=1)
+
+    assert seen[0].headers["content-type"] == "application/json"
+    assert orjson.loads(seen[0].content) == validated["body"].model_dump(mode="json")
+
+
+async def test_call_wraps_non_json_success_body():
+    def handler(request: httpx.Request) -> httpx.Response:
+        return httpx.Response(200, text="ok", headers={"content-type": "text/plain"})
+
+    spec = get_tool_spec("cxxtract.health.get")
+    assert spec is not None
+    async with _client_with(handler) as client:
+        data = await client.call(spec=spec, validated=validate_arguments(spec, {}), request_id=1)
+    assert data == {"raw": "ok"}
+
+
+async def test_call_wraps_malformed_json_success_body():
+    def handler(request: httpx.Request) -> httpx.Response:
+        return httpx.Response(200, content=b'{"a":1', headers={"content-type": "application/json"})
+
+    spec = get_tool_spec("cxxtract.health.get")
+    assert spec is not None
+    async with _client_with(handler) as client:
+        data = await client.call(spec=spec, validated=validate_arguments(spec, {}), request_id=1)
+    assert data == {"raw": '{"a":1'}
+
+
+async def test_call_raises_structured_error_after_retries():
+    attempts: list[int] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        attempts.append(1)
+        return httpx.Response(404, json={"detail": "job not found"})
+
+    spec = get_tool_spec("cxxtract.sync.job_get")
+    assert spec is not None
+    validated = validate_arguments(spec, {"job_id": "job-1"})
+    async with _client_with(handler) as client:
+        with pytest.raises(HttpToolError) as exc_info:
+            await client.call(spec=spec, validated=validated, request_id="r1")
+
+    envelope = exc_info.value.envelope
+    assert envelope["http_status"] == 404
+    assert envelope["error_code"] == "job not found"
+    assert envelope["tool_name"] == "cxxtract.sync.job_get"
+    assert envelope["attempt"] == len(attempts) == 2
+
+
+async def test_call_keeps_non_json_error_body_as_detail():
+    def handler(request: httpx.Request) -> httpx.Response:
+        return httpx.Response(502, text="<html>bad gateway</html>", headers={"content-type": "text/html"})
+
+    spec = get_tool_spec("cxxtract.health.get")
+    assert spec is not None
+    async with _client_with(handler) as client:
+        with pytest.raises(HttpToolError) as exc_info:
+            await client.call(spec=spec, validated=validate_arguments(spec, {}), request_id=1)
+
+    envelope = exc_info.value.envelope
+    assert envelope["http_status"] == 502
+    assert envelope["detail"] == envelope["error_code"] == "<html>bad gateway</html>"
+
+
+def test_url_for_caches_parameterless_paths():
+    client = CxxtractHttpClient(base_url="http://cxxtract.test/")
+    health = get_tool_spec("cxxtract.health.get")
+    job = get_tool_spec("cxxtract.sync.job_get")
+    assert health is not None and job is not None
+
+    url = client._url_for(health, {})
+    assert url == "http://cxxtract.test/health"
+    assert client._url_for(health, {}) is url
+    assert client._url_for(job, {"job_id": "a b"}) == "/sync-jobs/a%20b"
+
+
+def test_config_for_resolves_env_once_per_tool(monkeypatch):
+    monkeypatch.setenv("CXXTRACT_MCP_TIMEOUT_ATOMIC", "5")
+    monkeypatch.setenv("CXXTRACT_MCP_RETRIES_ATOMIC", "3")
+    client = CxxtractHttpClient(base_url="http://cxxtract.test")
+    read_spec = get_tool_spec("cxxtract.explore.read_file")
+    parse_spec = get_tool_spec("cxxtract.explore.parse_file")
+    assert read_spec is not None and parse_spec is not None
+
+    config = client._config_for(read_spec)
+    assert (config.timeout_s, config.retries) == (5.0, 3)
+    # Side-effectful POST tools never retry unless explicitly allowed.
+    assert client._config_for(parse_spec).retries == 0
+
+    monkeypatch.setenv("CXXTRACT_MCP_TIMEOUT_ATOMIC", "9")
+    assert client._config_for(read_spec) is config
+
+
+async def test_call_bounds_in_flight_requests(monkeypatch):
+    monkeypatch.setenv("CXXTRACT_MCP_WORKERS", "2")
+    in_flight = 0
+    peak = 0
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0.01)
+        in_flight -= 1
+        return httpx.Response(200, json={"status": "ok"})
+
+    spec = get_tool_spec("cxxtract.health.get")
+    assert spec is not None
+    validated = validate_arguments(spec, {})
+    async with _client_with(handler) as client:
+        await asyncio.gather(*(client.call(spec=spec, validated=validated, request_id=i) for i in range(6)))
+    assert peak == 2
+
+
+async def test_call_reports_transport_error_envelope():
+    def handler(request: httpx.Request) -> httpx.Response:
+        raise httpx.ConnectError("connection refused", request=request)
+
+    spec = get_tool_spec("cxxtract.health.get")
+    assert spec is not None
+    async with _client_with(handler) as client:
+        with pytest.raises(HttpToolError) as exc_info:
+            await client.call(spec=spec, validated=validate_arguments(spec, {}), request_id=9)
+
+    assert exc_info.value.envelope == {
+        "http_status": 0,
+        "error_code": "transport_error",
+        "detail": "connection refused",
+        "tool_name": "cxxtract.health.get",
+        "request_id": 9,
+        "attempt": 2,
+    }
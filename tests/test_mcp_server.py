@@ -0,0 +1,179 @@
+"""Tests for the MCP stdio server request handling."""
+
+from __future__ import annotations
+
+import io
+import os
+import sys
+from typing import Any
+
+import orjson
+import pytest
+
+from integrations.mcp_server import server
+from integrations.mcp_server.http_client import HttpToolError
+from integrations.mcp_server.tool_registry import TOOL_SPECS
+
+
+def _wire(response: dict[str, Any]) -> dict[str, Any]:
+    """Round-trip a response through the wire encoding (resolves Fragments)."""
+    return orjson.loads(orjson.dumps(response))
+
+
+class _FakeClient:
+    def __init__(self, result: Any = None, error: dict[str, Any] | None = None) -> None:
+        self.result = result
+        self.error = error
+        self.calls: list[str] = []
+
+    async def call(self, *, spec, validated, request_id):
+        self.calls.append(spec.name)
+        if self.error is not None:
+            raise HttpToolError(self.error)
+        return self.result
+
+
+async def test_initialize_and_unknown_method():
+    client = _FakeClient()
+    init = await server._handle_request(client, {"id": 1, "method": "initialize"})
+    assert init["result"]["serverInfo"]["name"] == server.SERVER_NAME
+
+    assert await server._handle_request(client, {"method": "notifications/initialized"}) is None
+
+    missing = await server._handle_request(client, {"id": 2, "method": "nope"})
+    assert missing["error"]["code"] == -32601
+
+
+async def test_tools_list_covers_registry():
+    resp = _wire(await server._handle_request(_FakeClient(), {"id": 1, "method": "tools/list"}))
+    names = [tool["name"] for tool in resp["result"]["tools"]]
+    assert names == [spec.name for spec in TOOL_SPECS]
+
+
+async def test_tools_call_success_and_error():
+    ok_client = _FakeClient(result={"status": "ok"})
+    ok = _wire(await server._handle_request(
+        ok_client,
+        {"id": 3, "method": "tools/call", "params": {"name": "cxxtract.health.get", "arguments": {}}},
+    ))
+    assert ok_client.calls == ["cxxtract.health.get"]
+    assert ok["result"]["isError"] is False
+    assert ok["result"]["structuredContent"] == {"status": "ok"}
+    assert orjson.loads(ok["result"]["content"][0]["text"]) == {"status": "ok"}
+
+    err_client = _FakeClient(error={"http_status": 503, "error_code": "vector_disabled"})
+    err = _wire(await server._handle_request(
+        err_client,
+        {"id": 4, "method": "tools/call", "params": {"name": "cxxtract.health.get", "arguments": {}}},
+    ))
+    assert err["result"]["isError"] is True
+    assert err["result"]["structuredContent"]["http_status"] == 503
+    assert err["result"]["content"][0]["text"] == '{"http_status":503,"error_code":"vector_disabled"}'
+
+
+async def test_tools_call_forwards_raw_json_bytes():
+    body = b'{"results":[{"path":"a.cpp","line":3}]}'
+    resp = await server._handle_request(
+        _FakeClient(result=body),
+        {"id": 6, "method": "tools/call", "params": {"name": "cxxtract.health.get", "arguments": {}}},
+    )
+    assert resp["result"]["content"][0]["text"] == body.decode("utf-8")
+    assert orjson.dumps(resp["result"]["structuredContent"]) == body
+
+
+async def test_tools_call_validation_error():
+    resp = _wire(await server._handle_request(
+        _FakeClient(),
+        {"id": 5, "method": "tools/call", "params": {"name": "cxxtract.sync.job_get", "arguments": {}}},
+    ))
+    assert resp["result"]["isError"] is True
+    assert resp["result"]["structuredContent"]["error_code"] == "validation_error"
+
+
+def test_message_framing_round_trip(monkeypatch):
+    monkeypatch.setattr(server, "_inbuf", bytearray())
+    out = io.TextIOWrapper(io.BytesIO(), encoding="utf-8")
+    monkeypatch.setattr(sys, "stdout", out)
+    server._write_message({"jsonrpc": "2.0", "id": 7, "result": {"text": "héllo"}})
+    framed = out.buffer.getvalue()
+    assert framed.startswith(b"Content-Length: ")
+
+    monkeypatch.setattr(sys, "stdin", io.TextIOWrapper(io.BytesIO(framed), encoding="utf-8"))
+    assert server._read_message() == {"jsonrpc": "2.0", "id": 7, "result": {"text": "héllo"}}
+    assert server._read_message() is None
+
+
+def test_read_message_ignores_extra_headers(monkeypatch):
+    monkeypatch.setattr(server, "_inbuf", bytearray())
+    body = b'{"jsonrpc":"2.0","id":1,"method":"tools/list"}'
+    framed = (
+        b"content-length: %d\r\nContent-Type: application/vscode-jsonrpc; charset=utf-8\r\n\r\n%b"
+        % (len(body), body)
+    )
+    monkeypatch.setattr(sys, "stdin", io.TextIOWrapper(io.BytesIO(framed), encoding="utf-8"))
+    assert server._read_message() == {"jsonrpc": "2.0", "id": 1, "method": "tools/list"}
+
+
+@pytest.mark.skipif(not hasattr(os, "writev"), reason="os.writev unavailable")
+def test_write_message_uses_raw_fd(monkeypatch):
+    read_fd, write_fd = os.pipe()
+    with os.fdopen(write_fd, "w") as stdout:
+        monkeypatch.setattr(sys, "stdout", stdout)
+        server._write_message({"jsonrpc": "2.0", "id": 1, "result": {}})
+    with os.fdopen(read_fd, "rb") as reader:
+        framed = reader.read()
+    body = b'{"jsonrpc":"2.0","id":1,"result":{}}'
+    assert framed == b"Content-Length: %d\r\n\r\n%b" % (len(body), body)
+
+
+def test_writev_all_handles_partial_writes(monkeypatch):
+    sink = bytearray()
+
+    def short_writev(fd, buffers):
+        chunk = b"".join(bytes(b) for b in buffers)[:5]
+        sink.extend(chunk)
+        return len(chunk)
+
+    monkeypatch.setattr(os, "writev", short_writev, raising=False)
+    server._writev_all(1, [b"Content-Length: 2\r\n\r\n", b"{}"])
+    assert bytes(sink) == b"Content-Length: 2\r\n\r\n{}"
+
+
+def _framed(*bodies: bytes) -> bytes:
+    return b"".join(b"Content-Length: %d\r\n\r\n%b" % (len(body), body) for body in bodies)
+
+
+def _read_frames(data: bytes) -> list[dict[str, Any]]:
+    frames = []
+    while data:
+        header, _, rest = data.partition(b"\r\n\r\n")
+        length = int(header.split(b":", 1)[1])
+        frames.append(orjson.loads(rest[:length]))
+        data = rest[length:]
+    return frames
+
+
+def test_read_message_splits_coalesced_frames(monkeypatch):
+    monkeypatch.setattr(server, "_inbuf", bytearray())
+    stream = _framed(b'{"id":1}', b'{"id":2}')
+    monkeypatch.setattr(sys, "stdin", io.TextIOWrapper(io.BytesIO(stream), encoding="utf-8"))
+
+    assert server._read_message() == {"id": 1}
+    assert server._read_message() == {"id": 2}
+    assert server._read_message() is None
+
+
+async def test_serve_answers_malformed_frame_and_keeps_reading(monkeypatch):
+    monkeypatch.setattr(server, "_inbuf", bytearray())
+    stream = _framed(b'{"id":', b'{"jsonrpc":"2.0","id":1,"method":"initialize"}')
+    monkeypatch.setattr(sys, "stdin", io.TextIOWrapper(io.BytesIO(stream), encoding="utf-8"))
+    out = io.TextIOWrapper(io.BytesIO(), encoding="utf-8")
+    monkeypatch.setattr(sys, "stdout", out)
+
+    await server._serve()
+
+    parse_error, init = _read_frames(out.buffer.getvalue())
+    assert parse_error["id"] is None
+    assert parse_error["error"]["code"] == -32700
+    assert init["id"] == 1
+    assert init["result"]["serverInfo"]["name"] == server.SERVER_NAME